@@ -0,0 +1,408 @@
+"""
+Bitboard board representation used by the AI search
+"""
+
+import random
+import threading
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.constants import WIN_CONDITION
+
+# Score of a window holding k stones of one player and none of the other
+LINE_SCORES = (0, 1, 10, 100, 500, 0)
+
+# Evaluation patterns: a WIN_CONDITION-cell window plus the flank cell on
+# each side, packed 2 bits per cell (cell k at bits 2k). Flanks off the
+# board read as WALL.
+PATTERN_LEN = WIN_CONDITION + 2
+WALL = 3
+# Multiplier of LINE_SCORES by free flanks (empty or own stone): a window
+# blocked at both ends is dead, as under the Caro blocked-both-ends rule
+FLANK_WEIGHTS = (0, 1, 2)
+
+
+def pattern_code(cells):
+    """Packed code of PATTERN_LEN cells (0 = empty, 1/2 = players, None or
+    WALL = off the board)"""
+    code = 0
+    for k, cell in enumerate(cells):
+        code |= (WALL if cell is None else cell) << (2 * k)
+    return code
+
+
+def _pattern_value(cells):
+    """Value of one pattern from player 1's point of view"""
+    core = cells[1:-1]
+    ones, twos = core.count(1), core.count(2)
+    if WALL in core or (ones and twos) or not (ones or twos):
+        return 0
+    owner, count = (1, ones) if ones else (2, twos)
+    free = sum(1 for flank in (cells[0], cells[-1]) if flank in (0, owner))
+    value = LINE_SCORES[count] * FLANK_WEIGHTS[free]
+    return value if owner == 1 else -value
+
+
+# PATTERN_SCORES[pattern_code(cells)]: _pattern_value(cells)
+PATTERN_SCORES = [
+    _pattern_value([(code >> (2 * k)) & 3 for k in range(PATTERN_LEN)])
+    for code in range(4 ** PATTERN_LEN)
+]
+
+_K = WIN_CONDITION + 1
+
+# Move-ordering weights, indexed by the stones already in a window:
+# extending your own window vs. spoiling one of the opponent's
+ATTACK_WEIGHTS = (1, 10, 100, 1000, 100000)
+DEFENSE_WEIGHTS = (0, 8, 80, 800, 50000)
+
+
+def _move_value(own, other):
+    """Ordering value of one window holding own and other stones"""
+    if own + other >= WIN_CONDITION:
+        return 0  # full window, cannot contain the empty cell
+    if not other:
+        return ATTACK_WEIGHTS[own]
+    if not own:
+        return DEFENSE_WEIGHTS[other]
+    return 0
+
+
+# MOVE_VALUES[symbol][c1 * (WIN_CONDITION + 1) + c2]: _move_value for symbol
+MOVE_VALUES = [
+    None,
+    [_move_value(c1, c2) for c1 in range(_K) for c2 in range(_K)],
+    [_move_value(c2, c1) for c1 in range(_K) for c2 in range(_K)],
+]
+
+# Window, neighbour and Zobrist tables shared by every board of the same
+# size, for the TABLE_CACHE_SIZES most recently used sizes (a growing
+# unbounded board moves through many sizes)
+TABLE_CACHE_SIZES = 4
+_size_tables = {}  # size -> tables, least recently used first
+_size_tables_lock = threading.Lock()
+
+
+def _build_window_tables(size):
+    """List every WIN_CONDITION-cell window of a size x size board and,
+    for each cell index, the ids of the windows through it (at most 20).
+
+    Window w is also the core of pattern w. Returns (windows,
+    cell_windows, cell_shifts, cell_flanks, pattern_codes): cell_shifts
+    gives the cell's bit shift in each pattern of cell_windows,
+    cell_flanks lists (pattern id, bit shift) for the patterns the cell
+    flanks, and pattern_codes are the empty board's codes (walls only).
+    """
+    stride = size + 1
+    windows = []
+    pattern_codes = []
+    cell_windows = [[] for _ in range(size * stride)]
+    cell_shifts = [[] for _ in range(size * stride)]
+    cell_flanks = [[] for _ in range(size * stride)]
+    for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        for i in range(size):
+            for j in range(size):
+                end_i = i + di * (WIN_CONDITION - 1)
+                end_j = j + dj * (WIN_CONDITION - 1)
+                if not (0 <= end_i < size and 0 <= end_j < size):
+                    continue
+                w = len(windows)
+                cells = tuple((i + di * k) * stride + j + dj * k
+                              for k in range(WIN_CONDITION))
+                for k, idx in enumerate(cells):
+                    cell_windows[idx].append(w)
+                    cell_shifts[idx].append(2 * (k + 1))
+                code = 0
+                for k in (-1, WIN_CONDITION):
+                    fi, fj = i + di * k, j + dj * k
+                    shift = 2 * (k + 1)
+                    if 0 <= fi < size and 0 <= fj < size:
+                        cell_flanks[fi * stride + fj].append((w, shift))
+                    else:
+                        code |= WALL << shift
+                windows.append(cells)
+                pattern_codes.append(code)
+    return (windows, [tuple(ids) for ids in cell_windows],
+            [tuple(shifts) for shifts in cell_shifts],
+            [tuple(entries) for entries in cell_flanks], pattern_codes)
+
+
+def _build_neighbour_table(size):
+    """For each cell index, the on-board cells of the surrounding 3x3 square"""
+    stride = size + 1
+    neighbours = [()] * (size * stride)
+    for i in range(size):
+        for j in range(size):
+            neighbours[i * stride + j] = tuple(
+                ni * stride + nj
+                for ni in range(max(0, i - 1), min(size, i + 2))
+                for nj in range(max(0, j - 1), min(size, j + 2))
+                if (ni, nj) != (i, j))
+    return neighbours
+
+
+def _build_zobrist_table(size):
+    """Random 64-bit key per (symbol, cell); seeded so hashes are stable"""
+    rng = random.Random(size)
+    cells = size * (size + 1)
+    return [None] + [[rng.getrandbits(64) for _ in range(cells)] for _ in range(2)]
+
+
+def _tables_for(size):
+    """(window tables, neighbour table, Zobrist table) of a board size"""
+    with _size_tables_lock:
+        tables = _size_tables.pop(size, None)
+        if tables is None:
+            tables = (_build_window_tables(size), _build_neighbour_table(size),
+                      _build_zobrist_table(size))
+        _size_tables[size] = tables
+        while len(_size_tables) > TABLE_CACHE_SIZES:
+            del _size_tables[next(iter(_size_tables))]
+        return tables
+
+
+class BitBoard:
+    """Square Caro board stored as one big-int bitboard per player.
+
+    Cell (i, j) maps to bit ``i * stride + j`` with ``stride = size + 1``.
+    The spare column is always empty, so shifting by 1 (rows), stride
+    (columns), stride + 1 (diagonal) or stride - 1 (anti-diagonal) never
+    lets a line wrap into the next row.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.stride = size + 1
+        self.shifts = (1, self.stride, self.stride + 1, self.stride - 1)
+        self.bits = [0, 0, 0]  # indexed by symbol, slot 0 unused
+        self.cells = bytearray(size * self.stride)
+        self.moves = []
+
+        window_tables, neighbours, zobrist = _tables_for(size)
+
+        # Per-window stone tallies and the running evaluation, kept up to
+        # date by place/undo so evaluate() is O(1)
+        (self.windows, self.cell_windows, self.cell_shifts, self.cell_flanks,
+         codes) = window_tables
+        self.window_counts = [None, [0] * len(self.windows), [0] * len(self.windows)]
+        # c1 * (WIN_CONDITION + 1) + c2 per window, the key into MOVE_VALUES
+        self.window_codes = [0] * len(self.windows)
+        # Packed cells of each pattern, the key into PATTERN_SCORES
+        self.pattern_codes = list(codes)
+        self.score = 0
+        # Windows where a symbol has 3+ stones and the opponent none
+        self.threat_windows = [None, set(), set()]
+
+        # Empty cells next to a stone (the move generator's candidates)
+        # and how many stones touch each cell
+        self.neighbours = neighbours
+        self.near = [0] * len(self.cells)
+        self.frontier = set()
+
+        # Zobrist hash of the stones on the board, updated by place/undo
+        self.zobrist = zobrist
+        self.hash = 0
+
+    @classmethod
+    def from_grid(cls, grid):
+        """Build a bitboard from a list-of-lists board (0 = empty)"""
+        board = cls(len(grid))
+        for i, row in enumerate(grid):
+            for j, symbol in enumerate(row):
+                if symbol:
+                    board.place(board.index(i, j), symbol)
+        return board
+
+    def index(self, i, j):
+        """Bit index of cell (i, j)"""
+        return i * self.stride + j
+
+    def coords(self, idx):
+        """Cell (i, j) of a bit index"""
+        return divmod(idx, self.stride)
+
+    def get(self, i, j):
+        """Symbol at cell (i, j), 0 if empty"""
+        return self.cells[i * self.stride + j]
+
+    def place(self, idx, symbol):
+        """Put symbol on an empty cell (make move)"""
+        self.cells[idx] = symbol
+        self.bits[symbol] |= 1 << idx
+        self.hash ^= self.zobrist[symbol][idx]
+        self.moves.append(idx)
+        self._update_windows(idx, symbol, 1)
+        near = self.near
+        frontier = self.frontier
+        frontier.discard(idx)
+        for nb in self.neighbours[idx]:
+            near[nb] += 1
+            if not self.cells[nb]:
+                frontier.add(nb)
+
+    def undo(self):
+        """Take back the last placed stone (unmake move)"""
+        idx = self.moves.pop()
+        symbol = self.cells[idx]
+        self.cells[idx] = 0
+        self.bits[symbol] ^= 1 << idx
+        self.hash ^= self.zobrist[symbol][idx]
+        self._update_windows(idx, symbol, -1)
+        near = self.near
+        frontier = self.frontier
+        for nb in self.neighbours[idx]:
+            near[nb] -= 1
+            if not near[nb]:
+                frontier.discard(nb)
+        if near[idx]:
+            frontier.add(idx)
+        return idx
+
+    def _update_windows(self, idx, symbol, step):
+        """Add step stones of symbol to every window and pattern through idx"""
+        own = self.window_counts[symbol]
+        other = self.window_counts[3 - symbol]
+        mine = self.threat_windows[symbol]
+        theirs = self.threat_windows[3 - symbol]
+        codes = self.window_codes
+        code_step = step * (_K if symbol == 1 else 1)
+        patterns = self.pattern_codes
+        scores = PATTERN_SCORES
+        score = self.score
+        cell_step = step * symbol
+        for w, shift in zip(self.cell_windows[idx], self.cell_shifts[idx]):
+            count = own[w]
+            opponent = other[w]
+            count += step
+            own[w] = count
+            codes[w] += code_step
+            key = patterns[w]
+            new_key = key + (cell_step << shift)
+            patterns[w] = new_key
+            score += scores[new_key] - scores[key]
+            # Threat membership can only change around 3 stones
+            if count >= 2 or opponent >= 3:
+                if count >= 3 and not opponent:
+                    mine.add(w)
+                else:
+                    mine.discard(w)
+                if opponent >= 3 and not count:
+                    theirs.add(w)
+                else:
+                    theirs.discard(w)
+
+        for w, shift in self.cell_flanks[idx]:
+            key = patterns[w]
+            new_key = key + (cell_step << shift)
+            patterns[w] = new_key
+            score += scores[new_key] - scores[key]
+        self.score = score
+
+    def move_value(self, idx, symbol):
+        """Ordering score for symbol playing idx: windows it extends plus
+        opponent windows it spoils, weighted by their stone counts"""
+        table = MOVE_VALUES[symbol]
+        codes = self.window_codes
+        value = 0
+        for w in self.cell_windows[idx]:
+            value += table[codes[w]]
+        return value
+
+    def move_values(self, symbol, cells=None):
+        """move_value of many cells (default: the frontier) in one pass,
+        as a list of (value, idx)"""
+        table = MOVE_VALUES[symbol]
+        codes = self.window_codes
+        cell_windows = self.cell_windows
+        scored = []
+        for idx in (self.frontier if cells is None else cells):
+            value = 0
+            for w in cell_windows[idx]:
+                value += table[codes[w]]
+            scored.append((value, idx))
+        return scored
+
+    def evaluate(self, symbol):
+        """Sum of PATTERN_SCORES over all patterns, from symbol's point of view"""
+        return self.score if symbol == 1 else -self.score
+
+    def threat_cells(self, symbol, count):
+        """Empty cells of windows where symbol has count (>= 3) stones and
+        the opponent none: count 4 gives the cells that complete a five,
+        count 3 the cells that make a four."""
+        own = self.window_counts[symbol]
+        cells = self.cells
+        result = set()
+        for w in self.threat_windows[symbol]:
+            if own[w] == count:
+                for idx in self.windows[w]:
+                    if not cells[idx]:
+                        result.add(idx)
+        return result
+
+    def is_full(self):
+        """Check if every cell is occupied"""
+        return len(self.moves) == self.size * self.size
+
+    def has_five(self, symbol):
+        """Check if symbol has WIN_CONDITION stones in a row (shift-and-mask)"""
+        stones = self.bits[symbol]
+        for shift in self.shifts:
+            run = stones
+            for k in range(1, WIN_CONDITION):
+                run &= stones >> (k * shift)
+                if not run:
+                    break
+            if run:
+                return True
+        return False
+
+    def is_five_at(self, idx):
+        """Check if the stone at idx is part of WIN_CONDITION in a row.
+
+        Only the four lines through idx are walked, so this is the cheap
+        test to use right after placing that stone.
+        """
+        cells = self.cells
+        symbol = cells[idx]
+        limit = len(cells)
+        for shift in self.shifts:
+            count = 1
+            pos = idx + shift
+            while pos < limit and cells[pos] == symbol:
+                count += 1
+                pos += shift
+            pos = idx - shift
+            while pos >= 0 and cells[pos] == symbol:
+                count += 1
+                pos -= shift
+            if count >= WIN_CONDITION:
+                return True
+        return False
+
+    def empty_cells(self):
+        """Bit indexes of all empty on-board cells, in row-major order"""
+        cells = self.cells
+        size = self.size
+        stride = self.stride
+        return [idx for idx in range(len(cells))
+                if not cells[idx] and idx % stride != size]
+
+    def candidate_moves(self, radius=1):
+        """Empty cells within radius of any stone"""
+        if radius == 1:
+            return set(self.frontier)
+        cells = self.cells
+        size = self.size
+        moves = set()
+        for idx in self.moves:
+            i, j = divmod(idx, self.stride)
+            for ni in range(max(0, i - radius), min(size, i + radius + 1)):
+                base = ni * self.stride
+                for nj in range(max(0, j - radius), min(size, j + radius + 1)):
+                    if not cells[base + nj]:
+                        moves.add(base + nj)
+        return moves
@@ -0,0 +1,117 @@
+"""
+NumPy board evaluation: every 5-cell window scored in a few array operations
+"""
+
+try:
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+except ImportError:  # optional dependency, AIPlayer falls back to BitBoard
+    np = None
+
+from ai_board import MOVE_VALUES, PATTERN_LEN, PATTERN_SCORES, WALL, WIN_CONDITION, _K
+
+HAS_NUMPY = np is not None
+
+if HAS_NUMPY:
+    _PATTERN_SCORES = np.array(PATTERN_SCORES, dtype=np.int64)
+    _MOVE_VALUES = [None] + [np.array(MOVE_VALUES[s], dtype=np.int64) for s in (1, 2)]
+
+
+def window_sums(mask):
+    """Stones of a 0/1 int8 mask in every WIN_CONDITION-cell window.
+
+    Returns one array per direction: rows, columns, diagonals and
+    anti-diagonals, each indexed by the window's first cell.
+    """
+    n = WIN_CONDITION
+    size = mask.shape[0]
+    if size < n:
+        return []
+    span = size - n + 1
+    rows = sliding_window_view(mask, n, axis=1).sum(axis=-1, dtype=np.int8)
+    cols = sliding_window_view(mask, n, axis=0).sum(axis=-1, dtype=np.int8)
+    diag = sum(mask[k:k + span, k:k + span] for k in range(n))
+    anti = sum(mask[k:k + span, n - 1 - k:size - k] for k in range(n))
+    return [rows, cols, diag, anti]
+
+
+def pattern_codes(cells):
+    """PATTERN_SCORES index of every pattern of an int8 board, one array
+    per direction in the order and layout of window_sums"""
+    n = WIN_CONDITION
+    size = cells.shape[0]
+    if size < n:
+        return []
+    span = size - n + 1
+    padded = np.pad(cells.astype(np.intp), 1, constant_values=WALL)
+    codes = [np.zeros((size, span), np.intp), np.zeros((span, size), np.intp),
+             np.zeros((span, span), np.intp), np.zeros((span, span), np.intp)]
+    for k in range(PATTERN_LEN):
+        shift = 2 * k
+        codes[0] += padded[1:1 + size, k:k + span] << shift
+        codes[1] += padded[k:k + span, 1:1 + size] << shift
+        codes[2] += padded[k:k + span, k:k + span] << shift
+        codes[3] += padded[k:k + span, n + 1 - k:n + 1 - k + span] << shift
+    return codes
+
+
+class NumpyBoard:
+    """Square board held as an int8 array (0 = empty, 1/2 = players).
+
+    Unlike BitBoard nothing is incremental: each call rescans the whole
+    board, which suits one-off evaluation of list-of-lists positions.
+    """
+
+    def __init__(self, grid):
+        self.cells = np.asarray(grid, dtype=np.int8)
+        self.size = self.cells.shape[0]
+
+    def window_counts(self):
+        """(player 1 sums, player 2 sums) per direction, see window_sums"""
+        return (window_sums((self.cells == 1).view(np.int8)),
+                window_sums((self.cells == 2).view(np.int8)))
+
+    def evaluate(self, symbol):
+        """Sum of PATTERN_SCORES over all patterns, from symbol's point of view"""
+        total = int(sum(_PATTERN_SCORES[codes].sum() for codes in pattern_codes(self.cells)))
+        return total if symbol == 1 else -total
+
+    def move_values(self, symbol):
+        """BitBoard.move_value of every cell at once, as a size x size
+        array (0 on occupied cells)"""
+        n = WIN_CONDITION
+        size = self.size
+        span = size - n + 1
+        table = _MOVE_VALUES[symbol]
+        values = np.zeros((size, size), dtype=np.int64)
+        if size < n:
+            return values
+        ones, twos = self.window_counts()
+        rows, cols, diag, anti = (table[c1.astype(np.intp) * _K + c2]
+                                  for c1, c2 in zip(ones, twos))
+        # Each window's value goes to its n cells, as in window_sums
+        for k in range(n):
+            values[:, k:k + span] += rows
+            values[k:k + span, :] += cols
+            values[k:k + span, k:k + span] += diag
+            values[k:k + span, n - 1 - k:size - k] += anti
+        values[self.cells != 0] = 0
+        return values
+
+    def frontier(self):
+        """Boolean array of the empty cells next to a stone"""
+        stones = np.pad(self.cells != 0, 1)
+        size = self.size
+        near = np.zeros((size, size), dtype=bool)
+        for di in (0, 1, 2):
+            for dj in (0, 1, 2):
+                near |= stones[di:di + size, dj:dj + size]
+        return near & (self.cells == 0)
+
+    def has_five(self, symbol):
+        """Whether symbol has WIN_CONDITION in a row anywhere"""
+        mask = (self.cells == symbol).view(np.int8)
+        return any((sums == WIN_CONDITION).any() for sums in window_sums(mask))
+
+    def is_full(self):
+        return bool(self.cells.all())
@@ -0,0 +1,93 @@
+"""
+Opening book: precomputed AI replies for the first moves of a game
+"""
+
+import os
+
+BOOK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'opening_book.txt')
+
+# The 8 rotations/reflections as (a, b, c, d): (x, y) -> (a*x + b*y, c*x + d*y)
+SYMMETRIES = (
+    (1, 0, 0, 1), (0, -1, 1, 0), (-1, 0, 0, -1), (0, 1, -1, 0),
+    (-1, 0, 0, 1), (1, 0, 0, -1), (0, 1, 1, 0), (0, -1, -1, 0),
+)
+
+
+def canonical(stones):
+    """Normal form of a position under translation and the 8 symmetries.
+
+    stones: (x, y, symbol) tuples. Returns (key, transform, offset) where
+    key is the smallest serialisation over all symmetries, and transform
+    and offset map board coordinates into the key's frame.
+    """
+    best = None
+    for t in SYMMETRIES:
+        a, b, c, d = t
+        moved = sorted((a * x + b * y, c * x + d * y, s) for x, y, s in stones)
+        if not moved:
+            return '', t, (0, 0)
+        mx = min(p[0] for p in moved)
+        my = min(p[1] for p in moved)
+        key = ';'.join(f'{x - mx},{y - my},{s}' for x, y, s in moved)
+        if best is None or key < best[0]:
+            best = (key, t, (mx, my))
+    return best
+
+
+def to_canonical(x, y, transform, offset):
+    """Board coordinates -> frame of a canonical key"""
+    a, b, c, d = transform
+    return a * x + b * y - offset[0], c * x + d * y - offset[1]
+
+
+def from_canonical(x, y, transform, offset):
+    """Frame of a canonical key -> board coordinates"""
+    a, b, c, d = transform
+    x, y = x + offset[0], y + offset[1]
+    # The symmetries are orthogonal, so the inverse is the transpose
+    return a * x + c * y, b * x + d * y
+
+
+class OpeningBook:
+    """Canonical position -> reply, read from BOOK_FILE on first use.
+
+    Each line of the file is `x,y,s;x,y,s;... mx,my`: the stones of a
+    position in canonical form followed by the reply in the same frame.
+    """
+
+    def __init__(self, path=BOOK_FILE):
+        self.path = path
+        self._moves = None
+        self.max_stones = 0
+
+    def _load(self):
+        self._moves = {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line or line.startswith('#'):
+                        continue
+                    key, move = line.split(' ')
+                    x, y = move.split(',')
+                    self._moves[key] = (int(x), int(y))
+                    self.max_stones = max(self.max_stones, key.count(';') + 1)
+        except OSError:
+            pass
+
+    def lookup(self, stones):
+        """Book reply for stones ((x, y, symbol) tuples) in their coordinates, or None"""
+        if self._moves is None:
+            self._load()
+        if not stones or len(stones) > self.max_stones:
+            return None
+        key, transform, offset = canonical(stones)
+        move = self._moves.get(key)
+        if move is None:
+            return None
+        return from_canonical(move[0], move[1], transform, offset)
+
+    def __len__(self):
+        if self._moves is None:
+            self._load()
+        return len(self._moves)
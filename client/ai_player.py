@@ -3,48 +3,341 @@ AI Player for Caro Game using Minimax algorithm
 """
 
 import random
-from shared.constants import WIN_CONDITION
+import sys
+import os
+import time
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+
+# Add client and parent directories to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_board import BitBoard, PATTERN_SCORES, WIN_CONDITION, pattern_code
+from ai_threats import ThreatSolver
+from ai_opening import OpeningBook
+from ai_numpy import HAS_NUMPY, NumpyBoard
+
+# Terminal score; must dominate any evaluate_board sum
+WIN_SCORE = 100000
+# Scores beyond this are wins found at some ply, stored ply-independent
+WIN_THRESHOLD = WIN_SCORE - 1000
+
+# Move ordering: keep moves worth at least PRUNE_RATIO of the best one,
+# at most MAX_BRANCH per node
+PRUNE_RATIO = 0.05
+MAX_BRANCH = 20
+
+# Transposition table bound types
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Mixed into the Zobrist hash so the same stones with a different side to
+# move never share an entry
+MAXIMIZING_KEY = 0x9E3779B97F4A7C15
+
+# Unbounded boards are mirrored on a BitBoard spanning the stones plus
+# SPARSE_MARGIN empty cells per side, rounded up to SPARSE_SIZE_STEP; it is
+# rebuilt larger once a stone lands within SPARSE_EDGE cells of its edge.
+# The mirror is at most SPARSE_MAX_SIZE cells wide: stones spread wider
+# are cut down to the cluster around the latest move
+SPARSE_MARGIN = 8
+SPARSE_SIZE_STEP = 8
+SPARSE_EDGE = 4
+SPARSE_MAX_SIZE = 64
+
+
+def _score_to_tt(score, depth):
+    """Make a win score relative to the node before storing it"""
+    if score > WIN_THRESHOLD:
+        return score + depth
+    if score < -WIN_THRESHOLD:
+        return score - depth
+    return score
+
+
+def _score_from_tt(score, depth):
+    """Turn a stored win score back into one relative to the root"""
+    if score > WIN_THRESHOLD:
+        return score - depth
+    if score < -WIN_THRESHOLD:
+        return score + depth
+    return score
+
+
+class SearchTimeout(Exception):
+    """Raised inside minimax when the per-move deadline has passed or the
+    search was cancelled"""
+
+
+# Per-process AIPlayer used by pool workers, one per difficulty and table
+# size, so each worker keeps its transposition table warm between iterations
+_pool_players = {}
+
+
+def _search_root_moves(difficulty, tt_mb, size, stones, moves, depth, time_limit):
+    """Process-pool entry point: search some root moves at depth.
+
+    stones is the position as (index, symbol) pairs. Returns
+    ([(move, score), ...], nodes), or (None, nodes) if time ran out.
+    """
+    ai = _pool_players.get((difficulty, tt_mb))
+    if ai is None:
+        ai = _pool_players[(difficulty, tt_mb)] = AIPlayer(difficulty, tt_mb=tt_mb)
+    board = BitBoard(size)
+    for idx, symbol in stones:
+        board.place(idx, symbol)
+    ai.tt.new_search()
+    # Cutoffs from other positions (or board sizes) would mislead ordering
+    ai.killers = {}
+    ai.history = {}
+    ai.nodes = 0
+    ai.search_depth = depth
+    ai._deadline = time.perf_counter() + time_limit
+    results = []
+    best_score = float('-inf')
+    try:
+        for idx in moves:
+            board.place(idx, ai.ai_symbol)
+            score = ai.minimax(board, 0, False, best_score, float('inf'), idx)
+            board.undo()
+            results.append((idx, score))
+            best_score = max(best_score, score)
+    except SearchTimeout:
+        return None, ai.nodes
+    finally:
+        ai._deadline = float('inf')
+    return results, ai.nodes
+
+
+class TranspositionTable:
+    """Fixed-size hash table of search results.
+
+    Each slot holds (key, depth, score, flag, move, generation). A slot is
+    replaced when it is empty, holds the same position, comes from an
+    earlier search, or was searched no deeper than the new result.
+    """
+
+    # Rough cost of one filled slot: list pointer, tuple and its ints
+    ENTRY_BYTES = 160
+
+    def __init__(self, max_mb=16):
+        self.size = max(1, int(max_mb * 1024 * 1024) // self.ENTRY_BYTES)
+        self.slots = [None] * self.size
+        self.generation = 0
+        self.hits = 0
+        self.stores = 0
+
+    def new_search(self):
+        """Age existing entries so they give way to the next search"""
+        self.generation += 1
+
+    def probe(self, key):
+        """Entry stored for key, or None"""
+        entry = self.slots[key % self.size]
+        if entry and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key, depth, score, flag, move):
+        """Save a search result subject to the replacement policy"""
+        slot = key % self.size
+        old = self.slots[slot]
+        if (old is None or old[0] == key or old[5] != self.generation
+                or depth >= old[1]):
+            self.slots[slot] = (key, depth, score, flag, move, self.generation)
+            self.stores += 1
+
+    def clear(self):
+        """Drop every entry"""
+        self.slots = [None] * self.size
 
 
 class AIPlayer:
     """AI player using Minimax algorithm with alpha-beta pruning"""
 
-    def __init__(self, difficulty="medium", board_size=15):
+    def __init__(self, difficulty="medium", board_size=15, tt_mb=16, workers=1,
+                 backend="python"):
         """
         Initialize AI player
         difficulty: "easy", "medium", "hard"
         board_size: size of the game board
+        tt_mb: memory cap of the transposition table in megabytes
+        workers: processes for root-parallel search (1 = search in-process)
+        backend: "python" or "numpy", how list-of-lists boards are evaluated
+                 from scratch; "numpy" falls back to "python" without NumPy
         """
         self.difficulty = difficulty
         # stored board_size is optional; methods will use the actual board passed in
         self.board_size = board_size
-        # Reduced depth for faster response (0 = immediate, 1 = look ahead 1 move)
-        self.max_depth = {"easy": 0, "medium": 1, "hard": 2}[difficulty]
+        # Deepest iteration (0 = immediate, 1 = look ahead 1 move) and the
+        # default per-move time budget in seconds; hard deepens until time runs out
+        self.max_depth = {"easy": 0, "medium": 1, "hard": 12}[difficulty]
+        self.time_limit = {"easy": 0.5, "medium": 1.0, "hard": 3.0}[difficulty]
+        self.search_depth = self.max_depth  # depth of the running iteration
+        self._deadline = float('inf')
+        self._cancel = None  # threading.Event that aborts the running search
         self.ai_symbol = 2  # AI plays as O (2)
         self.player_symbol = 1  # Player is X (1)
+        self.nodes = 0  # minimax nodes visited, for benchmarking
+        # Kept across moves: positions from the previous search stay useful
+        self.tt = TranspositionTable(tt_mb)
+        self.tt_mb = tt_mb
+        # Move-ordering memory of the current search
+        self.killers = {}  # ply -> up to two moves that caused a cutoff
+        self.history = {}  # symbol -> {move: cutoff score}
+        # Forced-win solver tried before the main search (hard only)
+        self.threats = ThreatSolver() if difficulty == "hard" else None
+        # Precomputed replies for the first moves, loaded on first lookup (hard only)
+        self.book = OpeningBook() if difficulty == "hard" else None
+        # Root moves are split across a process pool when workers > 1
+        self.workers = workers
+        self._pool = None
+        # Search positions are BitBoards evaluated incrementally either way
+        self.backend = "numpy" if backend == "numpy" and HAS_NUMPY else "python"
+        # Persistent mirror of an unbounded board: (BitBoard, origin, stones)
+        self._sparse = None
+        self._sparse_lock = threading.Lock()
+        # Answers found by ponder(), keyed by the mirror's hash after the
+        # opponent's reply; ponder_hits counts the ones get_move_sparse used
+        self._ponder_moves = {}
+        self.ponder_hits = 0
     
-    def get_move(self, board):
-        """Get best move for AI"""
+    def get_move(self, board, time_limit=None, cancel=None):
+        """Get best move for AI within time_limit seconds.
+
+        cancel is an optional threading.Event; once set, the search stops
+        as if its time had run out.
+        """
         if self.difficulty == "easy":
             return self.get_random_move(board)
         else:
-            return self.get_best_move(board)
+            return self.get_best_move(board, time_limit, cancel)
     
     def get_random_move(self, board):
         """Get random valid move (easy mode)"""
-        valid_moves = []
-        n = len(board)
-        for i in range(n):
-            for j in range(n):
-                if board[i][j] == 0:
-                    valid_moves.append((i, j))
-        
+        board = self._as_bitboard(board)
+        valid_moves = board.empty_cells()
         if valid_moves:
-            return random.choice(valid_moves)
+            return board.coords(random.choice(valid_moves))
         return None
     
-    def get_best_move(self, board):
-        """Get best move using Minimax with alpha-beta pruning"""
+    def get_move_sparse(self, board_dict, time_limit=None, cancel=None):
+        """Get best move on an unbounded board.
+
+        board_dict maps global (x, y) to the symbol of every stone, as kept
+        by the views. The position is mirrored on a persistent BitBoard that
+        only receives the stones added since the last call. Returns global
+        (x, y), or None if no move is possible.
+        """
+        start = time.perf_counter()
+        with self._sparse_lock:
+            board, (ox, oy) = self._sync_sparse(board_dict)
+            move = self._ponder_moves.pop(board.hash, None)
+            if move is not None:
+                self.ponder_hits += 1
+            else:
+                # Rebuilding the mirror comes out of the move's time budget
+                if time_limit is None:
+                    time_limit = self.time_limit
+                time_limit = max(0.0, time_limit - (time.perf_counter() - start))
+                move = self.get_move(board, time_limit, cancel)
+            if move is None:
+                return None
+            return move[0] + ox, move[1] + oy
+
+    def ponder(self, board_dict, cancel, time_limit=None, replies=3):
+        """Search ahead during the opponent's turn.
+
+        For the opponent's `replies` likeliest moves on board_dict, finds
+        the AI's answer as get_move_sparse would and caches it, so the
+        real call returns at once when the opponent plays one of them.
+        Runs until done or cancel is set; meant for a worker thread. The
+        transposition table stays warm for the real search either way.
+        """
+        with self._sparse_lock:
+            board, _ = self._sync_sparse(board_dict)
+            self._ponder_moves = {}
+            if self.difficulty == "easy" or board.is_full():
+                return
+            for idx in self._ordered_moves(board, self.player_symbol, 0)[:replies]:
+                if cancel.is_set():
+                    break
+                board.place(idx, self.player_symbol)
+                try:
+                    if not board.is_five_at(idx) and not board.is_full():
+                        move = self.get_move(board, time_limit, cancel)
+                        # An interrupted search is no better than a fresh one
+                        if move is not None and not cancel.is_set():
+                            self._ponder_moves[board.hash] = move
+                finally:
+                    board.undo()
+
+    def _sync_sparse(self, board_dict):
+        """Bring the sparse mirror up to date with board_dict.
+
+        New stones are placed incrementally. The board is rebuilt when a
+        stone was removed or changed (a new game) or when a new stone lies
+        too close to the edge. When the stones span more than
+        SPARSE_MAX_SIZE cells, the board is framed around the stones near
+        the latest move (the last one added to board_dict) and stones
+        outside that frame are left out. Returns (board, origin).
+        """
+        stones = {pos: symbol for pos, symbol in board_dict.items() if symbol}
+        if self._sparse is not None:
+            board, (ox, oy), known = self._sparse
+            if len(stones) >= len(known) and all(
+                    stones.get(pos) == symbol for pos, symbol in known.items()):
+                added = [(pos, symbol) for pos, symbol in stones.items() if pos not in known]
+                limit = board.size - SPARSE_EDGE
+                if all(SPARSE_EDGE <= x - ox < limit and SPARSE_EDGE <= y - oy < limit
+                       for (x, y), _ in added):
+                    for (x, y), symbol in added:
+                        board.place(board.index(x - ox, y - oy), symbol)
+                        known[(x, y)] = symbol
+                    return board, (ox, oy)
+
+        xs = [x for x, _ in stones] or [0]
+        ys = [y for _, y in stones] or [0]
+        if max(max(xs) - min(xs), max(ys) - min(ys)) + 1 + 2 * SPARSE_MARGIN > SPARSE_MAX_SIZE:
+            # Frame the stones within reach of the latest move; their span
+            # plus the margins still fits SPARSE_MAX_SIZE
+            lx, ly = next(reversed(stones))
+            reach = (SPARSE_MAX_SIZE - 1) // 2 - SPARSE_MARGIN
+            near = [(x, y) for x, y in stones if abs(x - lx) <= reach and abs(y - ly) <= reach]
+            xs = [x for x, _ in near]
+            ys = [y for _, y in near]
+        span = max(max(xs) - min(xs), max(ys) - min(ys)) + 1 + 2 * SPARSE_MARGIN
+        size = min(-(-span // SPARSE_SIZE_STEP) * SPARSE_SIZE_STEP, SPARSE_MAX_SIZE)
+        ox = (min(xs) + max(xs)) // 2 - size // 2
+        oy = (min(ys) + max(ys)) // 2 - size // 2
+        board = BitBoard(size)
+        # Every stone inside the frame, not only the ones that chose it
+        for (x, y), symbol in stones.items():
+            if 0 <= x - ox < size and 0 <= y - oy < size:
+                board.place(board.index(x - ox, y - oy), symbol)
+        # Every stone counts as known, so the ones left out do not force a
+        # rebuild on each call
+        self._sparse = (board, (ox, oy), stones)
+        self._ponder_moves = {}
+        return board, (ox, oy)
+
+    def get_best_move(self, board, time_limit=None, cancel=None):
+        """Get best move using iterative-deepening Minimax with alpha-beta pruning
+
+        Searches depth 0, 1, 2... up to max_depth until time_limit seconds
+        (default: the difficulty's time_limit) have passed, and returns the
+        best move of the last completed iteration.
+        """
+        board = self._as_bitboard(board)
+        if board.is_full():
+            return None
+
+        book_move = self._book_move(board)
+        if book_move:
+            return book_move
+        self.tt.new_search()
+
         # First check if there's an immediate winning move
         winning_move = self.find_winning_move(board, self.ai_symbol)
         if winning_move:
@@ -55,206 +348,321 @@ class AIPlayer:
         if blocking_move:
             return blocking_move
         
+        if time_limit is None:
+            time_limit = self.time_limit
+
+        # A forced win by fours/threes is found far beyond the search horizon
+        if self.threats:
+            start = time.perf_counter()
+            forced = self.threats.solve(board, self.ai_symbol, time_limit * 0.2, cancel)
+            if forced is not None:
+                return board.coords(forced)
+            time_limit -= time.perf_counter() - start
+
+        # Get moves near existing pieces, best first
+        self.killers = {}
+        self.history = {}
+        moves = self._ordered_moves(board, self.ai_symbol, 0)
+        best_move = moves[0]
+
+        self._deadline = time.perf_counter() + time_limit
+        self._cancel = cancel
+        stones = len(board.moves)
+        try:
+            for depth in range(self.max_depth + 1):
+                self.search_depth = depth
+                # Shallow iterations are cheaper than a pool round-trip
+                if self.workers > 1 and depth >= 2 and len(moves) > 1:
+                    best_move, best_score = self._search_root_parallel(board, moves)
+                else:
+                    best_move, best_score = self._search_root(board, moves)
+                # Search the best move first in the next iteration
+                moves.remove(best_move)
+                moves.insert(0, best_move)
+                if abs(best_score) > WIN_THRESHOLD:
+                    break
+        except SearchTimeout:
+            # Unwind the interrupted iteration; its partial result is dropped
+            while len(board.moves) > stones:
+                board.undo()
+        finally:
+            self._deadline = float('inf')
+            self._cancel = None
+            self.search_depth = self.max_depth
+
+        return board.coords(best_move)
+
+    def _book_move(self, board):
+        """Opening-book reply for the position, if it is on the board and empty"""
+        if self.book is None:
+            return None
+        stones = [board.coords(idx) + (board.cells[idx],) for idx in board.moves]
+        move = self.book.lookup(stones)
+        if move is None:
+            return None
+        i, j = move
+        if 0 <= i < board.size and 0 <= j < board.size and not board.get(i, j):
+            return move
+        return None
+
+    def _search_root(self, board, moves):
+        """One full-width iteration over the root moves at search_depth"""
         best_score = float('-inf')
-        best_move = None
-        
-        # Get moves near existing pieces (optimization)
-        moves = self.get_smart_moves(board)
-        
-        for move in moves:
-            i, j = move
-            board[i][j] = self.ai_symbol
-            score = self.minimax(board, 0, False, float('-inf'), float('inf'))
-            board[i][j] = 0
-            
+        best_move = moves[0]
+        for idx in moves:
+            board.place(idx, self.ai_symbol)
+            score = self.minimax(board, 0, False, best_score, float('inf'), idx)
+            board.undo()
             if score > best_score:
                 best_score = score
-                best_move = move
-        
-        return best_move if best_move else self.get_random_move(board)
+                best_move = idx
+        return best_move, best_score
     
+    def _search_root_parallel(self, board, moves):
+        """_search_root with the root moves dealt round-robin to the pool"""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        stones = [(idx, board.cells[idx]) for idx in board.moves]
+        time_limit = self._deadline - time.perf_counter()
+        futures = [
+            self._pool.submit(_search_root_moves, self.difficulty, self.tt_mb, board.size, stones,
+                              moves[k::self.workers], self.search_depth, time_limit)
+            for k in range(min(self.workers, len(moves)))
+        ]
+        scores = {}
+        for future in futures:
+            while True:
+                if self._cancel and self._cancel.is_set():
+                    raise SearchTimeout()
+                try:
+                    results, nodes = future.result(timeout=0.05)
+                    break
+                except FutureTimeout:
+                    continue
+            self.nodes += nodes
+            if results is None:
+                raise SearchTimeout()
+            scores.update(results)
+        # Ties go to the earlier (better ordered) move, as in _search_root
+        best_move = max(moves, key=lambda idx: (scores[idx], -moves.index(idx)))
+        return best_move, scores[best_move]
+
+    def close(self):
+        """Shut down the worker processes of the parallel search"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
     def find_winning_move(self, board, symbol):
         """Find immediate winning move for symbol"""
-        n = len(board)
-        for i in range(n):
-            for j in range(n):
-                if board[i][j] == 0:
-                    board[i][j] = symbol
-                    if self.check_winner(board, symbol):
-                        board[i][j] = 0
-                        return (i, j)
-                    board[i][j] = 0
+        board = self._as_bitboard(board)
+        # A completing cell always touches one of the existing stones
+        for idx in sorted(board.candidate_moves()):
+            board.place(idx, symbol)
+            won = board.has_five(symbol)
+            board.undo()
+            if won:
+                return board.coords(idx)
         return None
     
-    def get_smart_moves(self, board):
-        """Get moves near existing pieces (optimization)"""
-        moves = set()
-        has_piece = False
-        # Check if board is empty and collect nearby empty cells
-        n = len(board)
-        for i in range(n):
-            for j in range(n):
-                if board[i][j] != 0:
-                    has_piece = True
-                    # Add cells around this piece (reduced range for speed)
-                    for di in range(-1, 2):
-                        for dj in range(-1, 2):
-                            ni, nj = i + di, j + dj
-                            if (0 <= ni < n and 0 <= nj < n and board[ni][nj] == 0):
-                                moves.add((ni, nj))
-        
+    def get_smart_moves(self, board, symbol=None):
+        """Get moves near existing pieces, best first (for symbol, default AI)"""
+        board = self._as_bitboard(board)
+        if symbol is None:
+            symbol = self.ai_symbol
+        return [board.coords(idx) for idx in self._ordered_moves(board, symbol, 0)]
+
+    def score_moves(self, board, symbol=None):
+        """Ordering value of every candidate move for symbol (default AI).
+
+        All candidates are scored in one batched pass: a single array
+        computation on the NumPy backend, otherwise one sweep over the
+        BitBoard's window table. Returns {(i, j): value}.
+        """
+        if symbol is None:
+            symbol = self.ai_symbol
+        if self.backend == "numpy" and not isinstance(board, BitBoard):
+            board = NumpyBoard(board)
+            values = board.move_values(symbol)
+            if not board.cells.any():
+                center = board.size // 2
+                return {(center, center): int(values[center, center])}
+            return {(int(i), int(j)): int(values[i, j])
+                    for i, j in zip(*board.frontier().nonzero())}
+        board = self._as_bitboard(board)
+        if not board.moves:
+            center = board.index(board.size // 2, board.size // 2)
+            return {board.coords(center): board.move_value(center, symbol)}
+        return {board.coords(idx): value for value, idx in board.move_values(symbol)}
+
+    def _ordered_moves(self, board, symbol, ply, tt_move=None):
+        """Candidate bit indexes for symbol, most promising first.
+
+        A winning cell is played at once and an opponent's winning cell
+        must be blocked. Otherwise the table move and this ply's killer
+        moves go first, then the rest by threat value plus history score;
+        moves worth less than PRUNE_RATIO of the best are dropped and at
+        most MAX_BRANCH are kept.
+        """
         # If board is empty, start in center
-        if not has_piece:
-            center = len(board) // 2
-            return [(center, center)]
-        
-        # Limit number of moves to consider (max 15 for speed)
-        moves_list = list(moves) if moves else [(len(board) // 2, len(board) // 2)]
-        if len(moves_list) > 15:
-            # Prioritize moves closer to center
-            center = len(board) // 2
-            moves_list.sort(key=lambda m: abs(m[0] - center) + abs(m[1] - center))
-            moves_list = moves_list[:15]
-        
-        return moves_list
+        if not board.moves:
+            center = board.size // 2
+            return [board.index(center, center)]
+
+        wins = board.threat_cells(symbol, 4)
+        if wins:
+            return [min(wins)]
+        blocks = board.threat_cells(3 - symbol, 4)
+        if blocks:
+            return sorted(blocks)
+
+        scored = board.move_values(symbol)
+        history = self.history.get(symbol)
+        if history:
+            scored = [(value + history.get(idx, 0), idx) for value, idx in scored]
+        if not scored:
+            return []
+        scored.sort(reverse=True)
+        floor = scored[0][0] * PRUNE_RATIO
+        moves = [idx for value, idx in scored[:MAX_BRANCH] if value >= floor]
+
+        # Moves that worked elsewhere are tried first if they are legal here
+        first = [tt_move] + self.killers.get(ply, [])
+        for idx in reversed(first):
+            if idx is not None and idx in board.frontier:
+                if idx in moves:
+                    moves.remove(idx)
+                moves.insert(0, idx)
+        return moves
+
+    def _record_cutoff(self, symbol, ply, idx, remaining):
+        """Remember a move that caused a beta cutoff"""
+        killers = self.killers.setdefault(ply, [])
+        if idx not in killers:
+            killers.insert(0, idx)
+            del killers[2:]
+        history = self.history.setdefault(symbol, {})
+        history[idx] = history.get(idx, 0) + remaining * remaining
     
-    def minimax(self, board, depth, is_maximizing, alpha, beta):
-        """Minimax algorithm with alpha-beta pruning"""
+    def minimax(self, board, depth, is_maximizing, alpha, beta, last_move=None):
+        """Minimax algorithm with alpha-beta pruning
+
+        last_move is the bit index of the stone just placed; only it can
+        have completed a five, so only its four lines are checked. Without
+        it the whole board is scanned for both players.
+        """
+        board = self._as_bitboard(board)
+        self.nodes += 1
+        if not self.nodes & 127 and (time.perf_counter() > self._deadline
+                                     or (self._cancel and self._cancel.is_set())):
+            raise SearchTimeout()
+
         # Check terminal states
-        ai_win = self.check_winner(board, self.ai_symbol)
-        player_win = self.check_winner(board, self.player_symbol)
-        
-        if ai_win:
-            return 1000 - depth
-        if player_win:
-            return -1000 + depth
-        if depth >= self.max_depth or self.is_board_full(board):
+        if last_move is not None:
+            if board.is_five_at(last_move):
+                if board.cells[last_move] == self.ai_symbol:
+                    return WIN_SCORE - depth
+                return -WIN_SCORE + depth
+        elif board.has_five(self.ai_symbol):
+            return WIN_SCORE - depth
+        elif board.has_five(self.player_symbol):
+            return -WIN_SCORE + depth
+        # The side to move completes a five next ply
+        if is_maximizing and board.threat_cells(self.ai_symbol, 4):
+            return WIN_SCORE - depth - 1
+        if not is_maximizing and board.threat_cells(self.player_symbol, 4):
+            return -WIN_SCORE + depth + 1
+        remaining = self.search_depth - depth
+        if remaining <= 0 or board.is_full():
             return self.evaluate_board(board)
-        
+
+        # Answer from the transposition table when it holds a deep enough result
+        key = board.hash ^ (MAXIMIZING_KEY if is_maximizing else 0)
+        entry = self.tt.probe(key)
+        tt_move = None
+        if entry:
+            _, entry_depth, entry_score, flag, tt_move, _ = entry
+            if entry_depth >= remaining:
+                score = _score_from_tt(entry_score, depth)
+                if flag == EXACT:
+                    return score
+                if flag == LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if beta <= alpha:
+                    return score
+
+        symbol = self.ai_symbol if is_maximizing else self.player_symbol
+        moves = self._ordered_moves(board, symbol, depth, tt_move)
+
+        alpha_orig, beta_orig = alpha, beta
+        best_move = None
         if is_maximizing:
             max_eval = float('-inf')
-            for move in self.get_smart_moves(board):
-                i, j = move
-                board[i][j] = self.ai_symbol
-                eval_score = self.minimax(board, depth + 1, False, alpha, beta)
-                board[i][j] = 0
-                max_eval = max(max_eval, eval_score)
+            for idx in moves:
+                board.place(idx, self.ai_symbol)
+                eval_score = self.minimax(board, depth + 1, False, alpha, beta, idx)
+                board.undo()
+                if eval_score > max_eval:
+                    max_eval = eval_score
+                    best_move = idx
                 alpha = max(alpha, eval_score)
                 if beta <= alpha:
+                    self._record_cutoff(symbol, depth, idx, remaining)
                     break
-            return max_eval
+            best_score = max_eval
         else:
             min_eval = float('inf')
-            for move in self.get_smart_moves(board):
-                i, j = move
-                board[i][j] = self.player_symbol
-                eval_score = self.minimax(board, depth + 1, True, alpha, beta)
-                board[i][j] = 0
-                min_eval = min(min_eval, eval_score)
+            for idx in moves:
+                board.place(idx, self.player_symbol)
+                eval_score = self.minimax(board, depth + 1, True, alpha, beta, idx)
+                board.undo()
+                if eval_score < min_eval:
+                    min_eval = eval_score
+                    best_move = idx
                 beta = min(beta, eval_score)
                 if beta <= alpha:
+                    self._record_cutoff(symbol, depth, idx, remaining)
                     break
-            return min_eval
+            best_score = min_eval
+
+        if best_score <= alpha_orig:
+            flag = UPPER
+        elif best_score >= beta_orig:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.tt.store(key, remaining, _score_to_tt(best_score, depth), flag, best_move)
+        return best_score
     
     def evaluate_board(self, board):
         """Evaluate board position"""
-        score = 0
-        # Evaluate all lines using the actual board size
-        n = len(board)
-        # Rows
-        for i in range(n):
-            for j in range(n - WIN_CONDITION + 1):
-                line = [board[i][j + k] for k in range(WIN_CONDITION)]
-                score += self.evaluate_line(line)
-        
-        # Columns
-        for i in range(n - WIN_CONDITION + 1):
-            for j in range(n):
-                line = [board[i + k][j] for k in range(WIN_CONDITION)]
-                score += self.evaluate_line(line)
-        
-        # Diagonals (top-left to bottom-right)
-        for i in range(n - WIN_CONDITION + 1):
-            for j in range(n - WIN_CONDITION + 1):
-                line = [board[i + k][j + k] for k in range(WIN_CONDITION)]
-                score += self.evaluate_line(line)
-        
-        # Diagonals (top-right to bottom-left)
-        for i in range(n - WIN_CONDITION + 1):
-            for j in range(WIN_CONDITION - 1, n):
-                line = [board[i + k][j - k] for k in range(WIN_CONDITION)]
-                score += self.evaluate_line(line)
-        
-        return score
+        if self.backend == "numpy" and not isinstance(board, BitBoard):
+            return NumpyBoard(board).evaluate(self.ai_symbol)
+        # Maintained incrementally by BitBoard.place/undo
+        return self._as_bitboard(board).evaluate(self.ai_symbol)
     
     def evaluate_line(self, line):
-        """Evaluate a line of 5 cells"""
-        ai_count = line.count(self.ai_symbol)
-        player_count = line.count(self.player_symbol)
-        empty_count = line.count(0)
-        
-        # If both players have pieces, line is blocked
-        if ai_count > 0 and player_count > 0:
-            return 0
-        
-        # AI has pieces
-        if ai_count > 0:
-            if ai_count == 4 and empty_count == 1:
-                return 500  # About to win
-            elif ai_count == 3 and empty_count == 2:
-                return 100
-            elif ai_count == 2 and empty_count == 3:
-                return 10
-            elif ai_count == 1 and empty_count == 4:
-                return 1
-        
-        # Player has pieces (negative for AI)
-        if player_count > 0:
-            if player_count == 4 and empty_count == 1:
-                return -500  # Must block
-            elif player_count == 3 and empty_count == 2:
-                return -100
-            elif player_count == 2 and empty_count == 3:
-                return -10
-            elif player_count == 1 and empty_count == 4:
-                return -1
-        
-        return 0
+        """Evaluate a line of 5 cells, or 7 with the cell beyond each end
+        (None = off the board); 5 cells are taken to have open ends"""
+        if len(line) == WIN_CONDITION:
+            line = [0] + list(line) + [0]
+        score = PATTERN_SCORES[pattern_code(line)]
+        return score if self.ai_symbol == 1 else -score
     
     def check_winner(self, board, symbol):
         """Check if symbol has won"""
-        # Check rows
-        n = len(board)
-        for i in range(n):
-            for j in range(n - WIN_CONDITION + 1):
-                if all(board[i][j + k] == symbol for k in range(WIN_CONDITION)):
-                    return True
-        
-        # Check columns
-        for i in range(n - WIN_CONDITION + 1):
-            for j in range(n):
-                if all(board[i + k][j] == symbol for k in range(WIN_CONDITION)):
-                    return True
-        
-        # Check diagonals (top-left to bottom-right)
-        for i in range(n - WIN_CONDITION + 1):
-            for j in range(n - WIN_CONDITION + 1):
-                if all(board[i + k][j + k] == symbol for k in range(WIN_CONDITION)):
-                    return True
-        
-        # Check diagonals (top-right to bottom-left)
-        for i in range(n - WIN_CONDITION + 1):
-            for j in range(WIN_CONDITION - 1, n):
-                if all(board[i + k][j - k] == symbol for k in range(WIN_CONDITION)):
-                    return True
-        
-        return False
+        if self.backend == "numpy" and not isinstance(board, BitBoard):
+            return NumpyBoard(board).has_five(symbol)
+        return self._as_bitboard(board).has_five(symbol)
     
     def is_board_full(self, board):
         """Check if board is full"""
-        n = len(board)
-        for i in range(n):
-            for j in range(n):
-                if board[i][j] == 0:
-                    return False
-        return True
+        return self._as_bitboard(board).is_full()
+
+    def _as_bitboard(self, board):
+        """Accept either a list-of-lists board or a BitBoard"""
+        if isinstance(board, BitBoard):
+            return board
+        return BitBoard.from_grid(board)
@@ -0,0 +1,198 @@
+"""
+Threat-space search for forced wins (VCF / VCT)
+"""
+
+import time
+
+
+class ThreatSolver:
+    """Search only forcing moves to find a forced win for one side.
+
+    VCF (victory by continuous fours) plays fours, each leaving the
+    defender a single reply, until an open four or double four appears.
+    VCT (victory by continuous threats) also allows open threes and lets
+    the defender answer with any cell of the threatened windows or with a
+    counter-four. Both work on a BitBoard and leave it unchanged.
+    """
+
+    def __init__(self, vcf_depth=10, vct_depth=3, max_nodes=10000):
+        """
+        vcf_depth: attacker moves allowed in a VCF line
+        vct_depth: attacker moves allowed in a VCT line
+        max_nodes: node budget per solve, the search gives up beyond it
+        """
+        self.vcf_depth = vcf_depth
+        self.vct_depth = vct_depth
+        self.max_nodes = max_nodes
+        self.nodes = 0
+        self._deadline = float('inf')
+        self._cancel = None
+        self._failed = {}
+
+    def solve(self, board, attacker, time_limit=None, cancel=None):
+        """First move of a forced win for attacker, or None.
+
+        Tries VCF first, then VCT. time_limit (seconds), max_nodes and the
+        optional cancel Event bound the work; running out counts as no win
+        found.
+        """
+        self.nodes = 0
+        self._deadline = float('inf') if time_limit is None else time.perf_counter() + time_limit
+        self._cancel = cancel
+        stones = len(board.moves)
+        try:
+            self._failed = {}
+            line = self._vcf(board, attacker, self.vcf_depth)
+            if not line:
+                self._failed = {}
+                line = self._vct(board, attacker, self.vct_depth)
+        except _OutOfBudget:
+            while len(board.moves) > stones:
+                board.undo()
+            line = None
+        return line[0] if line else None
+
+    def _tick(self):
+        """Count a node and stop once the budget is spent"""
+        self.nodes += 1
+        if self.nodes > self.max_nodes or (
+                not self.nodes & 63 and (time.perf_counter() > self._deadline
+                                         or (self._cancel and self._cancel.is_set()))):
+            raise _OutOfBudget()
+
+    def _known_fail(self, board, kind, depth):
+        """Whether this position already failed with at least depth moves left"""
+        return self._failed.get((board.hash, kind), -1) >= depth
+
+    def _forcing_candidates(self, board, attacker, moves):
+        """Restrict attacker moves when the defender threatens a five.
+
+        Returns None when the defender has two or more winning cells (the
+        attack is too slow), otherwise the moves that also block.
+        """
+        defender_wins = board.threat_cells(3 - attacker, 4)
+        if not defender_wins:
+            return moves
+        if len(defender_wins) > 1:
+            return None
+        return moves & defender_wins
+
+    def _vcf(self, board, attacker, depth):
+        """Line of moves (attacker, defender, ...) ending in a win, or None"""
+        self._tick()
+        wins = board.threat_cells(attacker, 4)
+        if wins:
+            return [min(wins)]
+        if depth <= 0 or self._known_fail(board, 'vcf', depth):
+            return None
+        defender = 3 - attacker
+        candidates = self._forcing_candidates(board, attacker, board.threat_cells(attacker, 3))
+        for move in sorted(candidates or ()):
+            board.place(move, attacker)
+            wins = board.threat_cells(attacker, 4)
+            line = None
+            if len(wins) >= 2:
+                line = [move]
+            elif wins:
+                reply = wins.pop()
+                board.place(reply, defender)
+                rest = self._vcf(board, attacker, depth - 1)
+                board.undo()
+                if rest:
+                    line = [move, reply] + rest
+            board.undo()
+            if line:
+                return line
+        self._failed[(board.hash, 'vcf')] = depth
+        return None
+
+    def _vct(self, board, attacker, depth):
+        """Like _vcf but open threes count as threats too"""
+        self._tick()
+        wins = board.threat_cells(attacker, 4)
+        if wins:
+            return [min(wins)]
+        if depth <= 0 or self._known_fail(board, 'vct', depth):
+            return None
+        line = self._vcf(board, attacker, min(depth * 2, self.vcf_depth))
+        if line:
+            return line
+
+        defender = 3 - attacker
+        fours = board.threat_cells(attacker, 3)
+        threes = self._three_moves(board, attacker)
+        candidates = self._forcing_candidates(board, attacker, fours | threes)
+        for move in sorted(candidates or (), key=lambda m: (m not in fours, m)):
+            board.place(move, attacker)
+            if self._defended(board, attacker, move, depth):
+                board.undo()
+                continue
+            board.undo()
+            return [move]
+        self._failed[(board.hash, 'vct')] = depth
+        return None
+
+    def _defended(self, board, attacker, move, depth):
+        """After attacker's threat at move, can some defender reply hold?"""
+        defender = 3 - attacker
+        wins = board.threat_cells(attacker, 4)
+        if len(wins) >= 2:
+            return False
+        if wins:
+            replies = wins
+        else:
+            # Cells of the open three's windows, plus counter-fours
+            replies = set()
+            own = board.window_counts[attacker]
+            for w in board.cell_windows[move]:
+                if w in board.threat_windows[attacker] and own[w] == 3:
+                    replies.update(idx for idx in board.windows[w] if not board.cells[idx])
+            replies |= board.threat_cells(defender, 3)
+        for reply in sorted(replies):
+            board.place(reply, defender)
+            line = self._vct(board, attacker, depth - 1)
+            board.undo()
+            if not line:
+                return True
+        return False
+
+    def _three_moves(self, board, attacker):
+        """Moves that create an open three: a follow-up four with two
+        completing cells (an open four) becomes available."""
+        moves = set()
+        own = board.window_counts[attacker]
+        other = board.window_counts[3 - attacker]
+        cells = board.cells
+        candidates = set()
+        for idx in board.moves:
+            if cells[idx] != attacker:
+                continue
+            for w in board.cell_windows[idx]:
+                if own[w] == 2 and not other[w]:
+                    candidates.update(c for c in board.windows[w] if not cells[c])
+        for move in candidates:
+            board.place(move, attacker)
+            if self._has_open_four_move(board, attacker, move):
+                moves.add(move)
+            board.undo()
+        return moves
+
+    def _has_open_four_move(self, board, attacker, move):
+        """Whether some four built with the stone at move has two
+        completing cells"""
+        own = board.window_counts[attacker]
+        follow_ups = set()
+        for w in board.cell_windows[move]:
+            if w in board.threat_windows[attacker] and own[w] == 3:
+                follow_ups.update(idx for idx in board.windows[w] if not board.cells[idx])
+        for follow in follow_ups:
+            board.place(follow, attacker)
+            open_four = len(board.threat_cells(attacker, 4)) >= 2
+            board.undo()
+            if open_four:
+                return True
+        return False
+
+
+class _OutOfBudget(Exception):
+    """Node or time budget of a solve exhausted"""
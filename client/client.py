@@ -198,6 +198,11 @@ class Client:
         if self.game_view:
             self.game_view.on_competitor_move(x, y)
     
+    def on_invalid_move(self, x, y):
+        """Handle a move the server rejected"""
+        if self.game_view:
+            self.game_view.on_invalid_move(x, y)
+    
     def on_game_result(self, result):
         """Handle game result"""
         if self.game_view:
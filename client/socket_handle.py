@@ -270,6 +270,13 @@ class SocketHandle:
                 y = int(parts[2])
                 print(f"[DEBUG] Competitor moved to ({x}, {y})")
                 self.client.on_competitor_move(x, y)
+        elif command == "invalid-move":
+            if len(parts) >= 3:
+                x = int(parts[1])
+                y = int(parts[2])
+                reason = parts[3] if len(parts) > 3 else ""
+                print(f"[DEBUG] Server rejected move ({x}, {y}): {reason}")
+                self.client.on_invalid_move(x, y)
         elif command == "you-win":
             self.client.on_game_result("win")
         elif command == "you-lose":
@@ -6,6 +6,8 @@ stubs for UI methods. We'll expand the UI later once import/tests pass.
 
 import sys
 import os
+import threading
+from queue import Queue, Empty
 from typing import Optional, Tuple
 
 try:
@@ -19,9 +21,12 @@ except Exception:
 
 # make sure package imports work
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from shared.constants import INITIAL_BOARD_SIZE, WIN_CONDITION, GAME_TIMEOUT
+from shared.constants import INITIAL_BOARD_SIZE, WIN_CONDITION, GAME_TIMEOUT, AI_TIME_SHARE
 from ai_player import AIPlayer
 
+# How often (ms) the Tk loop checks whether the AI worker has finished
+AI_POLL_INTERVAL = 50
+
 
 class GameAIView:
     """Small, import-safe GameAIView.
@@ -50,6 +55,15 @@ class GameAIView:
         self._ai_think_after_id = None
         self._ai_think_state = 0
 
+        # Background AI search: cancel token of the running search, id used to
+        # drop stale results, and the queue the worker reports through
+        self._ai_cancel = None
+        self._ai_search_id = 0
+        self._ai_results = Queue()
+        self._ai_poll_after_id = None
+        # Cancel token of the search the AI runs during the player's turn
+        self._ponder_cancel = None
+
         # If Tk is available, build the full GUI similar to GameView
         if _HAS_TK:
             # Prefer using the existing visible window (e.g. HomeView.window) as the
@@ -133,8 +147,9 @@ class GameAIView:
         if self.game_over or not self.my_turn or self.board_dict.get((x, y), 0) != 0:
             return False
 
-        # Place player move
+        # Place player move; the AI stops pondering and uses what it found
         self.board_dict[(x, y)] = 1
+        self._stop_ponder()
 
         # Update button if visible
         if self.window:
@@ -160,9 +175,9 @@ class GameAIView:
         self.update_turn_display()
         self.stop_timer()
 
-        # Ask AI to move after short delay so UI updates
+        # Search on a worker thread so the window stays responsive
         if self.window:
-            self.window.after(100, self._ai_move_and_update)
+            self._start_ai_search()
         else:
             self._ai_move_and_update()
 
@@ -174,13 +189,101 @@ class GameAIView:
 
     def _ai_move_and_update(self) -> Optional[Tuple[int, int]]:
         """Internal: compute AI move and update UI/state."""
-        n = self.view_size
-        local = [[0] * n for _ in range(n)]
-        for i in range(n):
-            for j in range(n):
-                local[i][j] = self.board_dict.get((self.origin_x + i, self.origin_y + j), 0)
+        move = self.ai.get_move_sparse(self._ai_snapshot(), self._ai_time_limit())
+        return self._apply_ai_move(move)
+
+    def _ai_snapshot(self):
+        """Copy of every stone on the board for the AI, independent of the viewport."""
+        return dict(self.board_dict)
 
-        move = self.ai.get_move(local)
+    def _start_ai_search(self):
+        """Run the AI search on a worker thread so the Tk loop keeps running.
+
+        The worker only touches its own board snapshot; the result goes
+        through a queue and is applied by _poll_ai_result on the Tk thread.
+        """
+        self._cancel_ai_search()
+        stones = self._ai_snapshot()
+        cancel = threading.Event()
+        search_id = self._ai_search_id
+        ai = self.ai
+        time_limit = self._ai_time_limit()
+        results = self._ai_results
+
+        def _worker():
+            try:
+                move = ai.get_move_sparse(stones, time_limit, cancel)
+            except Exception as e:
+                print(f"AI search failed: {e}")
+                move = None
+            if not cancel.is_set():
+                results.put((search_id, move))
+
+        self._ai_cancel = cancel
+        threading.Thread(target=_worker, daemon=True).start()
+        self._ai_poll_after_id = self.window.after(AI_POLL_INTERVAL, self._poll_ai_result)
+
+    def _poll_ai_result(self):
+        """Tk-thread side of _start_ai_search: apply the move once it is ready."""
+        self._ai_poll_after_id = None
+        # Skip results of older searches that finished before being cancelled
+        while True:
+            try:
+                search_id, move = self._ai_results.get_nowait()
+            except Empty:
+                if self._ai_cancel is not None:
+                    try:
+                        self._ai_poll_after_id = self.window.after(AI_POLL_INTERVAL, self._poll_ai_result)
+                    except Exception:
+                        pass
+                return
+            if search_id == self._ai_search_id:
+                break
+        if self.game_over:
+            self._ai_cancel = None
+            return
+        self._ai_cancel = None
+        self._apply_ai_move(move)
+
+    def _start_ponder(self):
+        """Let the AI search its answers to likely player moves while the player thinks."""
+        self._stop_ponder()
+        cancel = threading.Event()
+        stones = self._ai_snapshot()
+        ai = self.ai
+        time_limit = self._ai_time_limit()
+
+        def _worker():
+            try:
+                ai.ponder(stones, cancel, time_limit)
+            except Exception as e:
+                print(f"AI ponder failed: {e}")
+
+        self._ponder_cancel = cancel
+        threading.Thread(target=_worker, daemon=True).start()
+
+    def _stop_ponder(self):
+        if self._ponder_cancel is not None:
+            self._ponder_cancel.set()
+            self._ponder_cancel = None
+
+    def _cancel_ai_search(self):
+        """Abandon any running AI search (new game, difficulty change, close)."""
+        self._stop_ponder()
+        if self._ai_cancel is not None:
+            self._ai_cancel.set()
+            self._ai_cancel = None
+        # Results of older searches are ignored by id
+        self._ai_search_id += 1
+        if self._ai_poll_after_id and self.window:
+            try:
+                self.window.after_cancel(self._ai_poll_after_id)
+            except Exception:
+                pass
+        self._ai_poll_after_id = None
+
+    def _apply_ai_move(self, move) -> Optional[Tuple[int, int]]:
+        """Place the AI's move (global coords) and update UI/state."""
         if not move:
             # No move found
             self.my_turn = True
@@ -188,20 +291,16 @@ class GameAIView:
             self.start_timer()
             return None
 
-        li, lj = move
-        gx, gy = self.origin_x + li, self.origin_y + lj
-
-        # fallback if occupied
-        if self.board_dict.get((gx, gy), 0) != 0:
-            found = False
-            for i in range(n):
-                for j in range(n):
-                    if local[i][j] == 0:
-                        gx, gy = self.origin_x + i, self.origin_y + j
-                        found = True
-                        break
-                if found:
-                    break
+        gx, gy = move
+
+        # fallback if occupied: nearest empty cell around it
+        r = 1
+        while self.board_dict.get((gx, gy), 0) != 0:
+            ring = [(move[0] + dx, move[1] + dy) for dx in range(-r, r + 1) for dy in range(-r, r + 1)]
+            empty = [p for p in ring if self.board_dict.get(p, 0) == 0]
+            if empty:
+                gx, gy = empty[0]
+            r += 1
 
         # Store AI move
         self.board_dict[(gx, gy)] = 2
@@ -229,8 +328,15 @@ class GameAIView:
         self.my_turn = True
         self.update_turn_display()
         self.start_timer()
+        if self.window:
+            self._start_ponder()
         return gx, gy
 
+    def _ai_time_limit(self) -> float:
+        """Per-move AI budget: a slice of the configured turn time, capped by the AI's own limit."""
+        turn_seconds = getattr(self, '_timer_total', GAME_TIMEOUT)
+        return min(self.ai.time_limit, turn_seconds * AI_TIME_SHARE)
+
     def check_win(self, x: int, y: int, player: int) -> bool:
         dirs = [(0, 1), (1, 0), (1, 1), (1, -1)]
         for dx, dy in dirs:
@@ -249,9 +355,11 @@ class GameAIView:
 
     # Lightweight stubs for UI methods so other code can call them
     def new_game(self):
+        self._cancel_ai_search()
         self.board_dict.clear(); self.origin_x = 0; self.origin_y = 0; self.game_over = False; self.my_turn = True
 
     def change_difficulty(self, level: str):
+        self._cancel_ai_search()
         self.difficulty = level; self.ai = AIPlayer(level)
 
     def get_difficulty_name(self) -> str:
@@ -642,6 +750,7 @@ class GameAIView:
             self.go_home()
 
     def reset_game(self):
+        self._cancel_ai_search()
         self.game_over = False
         self.my_turn = True
         self.board_dict.clear()
@@ -667,6 +776,7 @@ class GameAIView:
         difficulty_window.resizable(False, False)
 
         def select_difficulty(level):
+            self._cancel_ai_search()
             self.difficulty = level
             self.ai = AIPlayer(level)
             self.window.title(f"Chơi với AI - Độ khó: {self.get_difficulty_name()}")
@@ -735,6 +845,7 @@ class GameAIView:
             pass
 
     def go_home(self):
+        self._cancel_ai_search()
         try:
             if self.window:
                 self.window.destroy()
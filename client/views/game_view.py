@@ -319,6 +319,16 @@ class GameView:
         self.update_turn_display()
         self.start_timer()
     
+    def on_invalid_move(self, x, y):
+        """Take back a move the server rejected and give the turn back"""
+        if self.board_dict.get((x, y)) != 1 or self.game_over:
+            return
+        del self.board_dict[(x, y)]
+        self.build_board_buttons()
+        self.my_turn = True
+        self.update_turn_display()
+        messagebox.showwarning("Cảnh báo", "Nước đi không hợp lệ")
+    
     def check_win(self, x, y, player):
         """Check if player wins at position (x, y) using sparse board dict."""
         directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
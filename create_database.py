@@ -4,6 +4,11 @@ Script tự động tạo database cho Caro Game
 
 import mysql.connector
 from mysql.connector import Error
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server'))
+from migrations import migrate
 
 def create_database():
     """Tạo database và tables tự động"""
@@ -69,8 +74,13 @@ def create_database():
             """)
             print("✅ Bảng 'banned_user' đã tạo!")
             
+            # Indexes và các thay đổi schema sau này (server/migrations.py)
+            print("\n5. Đang chạy migrations...")
+            applied = migrate(connection)
+            print(f"✅ Đã áp dụng {len(applied)} migration!")
+            
             # Thêm dữ liệu mẫu
-            print("\n5. Đang thêm dữ liệu mẫu...")
+            print("\n6. Đang thêm dữ liệu mẫu...")
             try:
                 cursor.execute("""
                     INSERT INTO `user` (username, password, nickname, avatar, numberOfGame, numberOfWin, numberOfDraw) 
@@ -88,7 +98,7 @@ def create_database():
                     raise e
             
             # Kiểm tra
-            print("\n6. Kiểm tra dữ liệu...")
+            print("\n7. Kiểm tra dữ liệu...")
             cursor.execute("SELECT COUNT(*) FROM `user`")
             count = cursor.fetchone()[0]
             print(f"✅ Có {count} user trong database!")
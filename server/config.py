@@ -10,8 +10,17 @@ DB_CONFIG = {
     'database': 'caro_game'
 }
 
+# Connection pool shared by every UserDAO
+DB_POOL_SIZE = 10  # open connections at most
+DB_POOL_TIMEOUT = 10  # seconds to wait for a free connection
+DB_POOL_PING_AFTER = 30  # ping connections idle longer than this before reuse
+RESULT_FLUSH_INTERVAL = 2.0  # seconds between batched game-result writes
+PRESENCE_PERSIST_INTERVAL = 30  # seconds between IsOnline/IsPlaying snapshots
+RANK_CHART_SIZE = 100  # users in the rank chart
+
 # Server Configuration
 SERVER_HOST = '0.0.0.0'  # Listen on all interfaces
 SERVER_PORT = 7777
 MAX_CLIENTS = 100
-THREAD_POOL_SIZE = 10
+THREAD_POOL_SIZE = 10  # DB worker threads of the asyncio server
+LISTEN_BACKLOG = 1024  # pending connections queued by the asyncio server
@@ -0,0 +1,145 @@
+"""
+Bounded MySQL connection pool shared by every UserDAO
+"""
+
+import queue
+import threading
+import time
+import sys
+import os
+from contextlib import contextmanager
+
+import mysql.connector
+from mysql.connector import Error, InterfaceError, OperationalError
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Import from same directory
+from config import DB_CONFIG, DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_POOL_PING_AFTER
+
+
+class PoolExhausted(Error):
+    """No connection became free within the pool timeout"""
+
+
+class ConnectionPool:
+    """At most `size` open connections, handed out one caller at a time.
+
+    Idle connections are reused most-recent first. One that sat idle longer
+    than ping_after seconds is pinged (and reconnected) before reuse, and
+    one that fails mid-statement with a connection error is discarded, so
+    a dropped MySQL server costs one failed call instead of a dead pool.
+    """
+
+    def __init__(self, config=DB_CONFIG, size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT,
+                 ping_after=DB_POOL_PING_AFTER):
+        self.config = config
+        self.size = size
+        self.timeout = timeout
+        self.ping_after = ping_after
+        self._slots = threading.BoundedSemaphore(size)
+        # (connection, time it was returned)
+        self._idle = queue.LifoQueue()
+
+    def _connect(self):
+        # Autocommit: a single statement is a single round trip
+        connection = mysql.connector.connect(autocommit=True, **self.config)
+        if connection.is_connected():
+            print("Database connection successful")
+        return connection
+
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except Error:
+            pass
+
+    def _healthy(self, connection, idle_since):
+        """Ping a connection that has been idle for a while, reconnecting if needed"""
+        if time.monotonic() - idle_since < self.ping_after:
+            return True
+        try:
+            connection.ping(reconnect=True, attempts=1)
+            return True
+        except Error:
+            return False
+
+    def acquire(self):
+        """Take a connection, waiting up to timeout for a free slot"""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolExhausted(f"no database connection free after {self.timeout}s")
+        try:
+            while True:
+                try:
+                    connection, idle_since = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._connect()
+                if self._healthy(connection, idle_since):
+                    return connection
+                self._discard(connection)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, connection, broken=False):
+        """Give a connection back; broken ones are closed instead of reused"""
+        if broken:
+            self._discard(connection)
+        else:
+            self._idle.put((connection, time.monotonic()))
+        self._slots.release()
+
+    @contextmanager
+    def cursor(self, transaction=False):
+        """Cursor on a pooled connection.
+
+        Statements autocommit one by one; with transaction=True the block
+        runs in one transaction, committed when it succeeds.
+        """
+        connection = self.acquire()
+        broken = False
+        try:
+            if transaction:
+                connection.start_transaction()
+            cursor = connection.cursor()
+            try:
+                yield cursor
+                if transaction:
+                    connection.commit()
+            finally:
+                cursor.close()
+        except (InterfaceError, OperationalError):
+            broken = True
+            raise
+        except BaseException:
+            # Not only SQL errors: any exception leaving the block must not
+            # hand the next caller an open transaction
+            try:
+                connection.rollback()
+            except Error:
+                broken = True
+            raise
+        finally:
+            self.release(connection, broken)
+
+    def close(self):
+        """Close the idle connections"""
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(connection)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """The process-wide pool, created on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool()
+        return _pool
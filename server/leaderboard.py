@@ -0,0 +1,162 @@
+"""
+In-process leaderboard
+Built from the database once, then kept current as game results are
+recorded, so ranks and the rank chart no longer cost a query
+"""
+
+import copy
+import threading
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Import from same directory
+from config import RANK_CHART_SIZE
+from user_dao import UserDAO
+
+
+class FenwickTree:
+    """Counts at indexes 0..size-1 with prefix sums, both O(log size)"""
+
+    def __init__(self, size):
+        self.counts = [0] * size
+        self.tree = [0] * (size + 1)
+
+    def _grow(self, size):
+        """Rebuild with room for `size` indexes"""
+        self.counts += [0] * (size - len(self.counts))
+        self.tree = [0] * (size + 1)
+        for index, count in enumerate(self.counts):
+            i = index + 1
+            self.tree[i] += count
+            parent = i + (i & -i)
+            if parent <= size:
+                self.tree[parent] += self.tree[i]
+
+    def add(self, index, delta):
+        if index >= len(self.counts):
+            self._grow(max(index + 1, 2 * len(self.counts)))
+        self.counts[index] += delta
+        i = index + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, index):
+        """Sum of the counts at 0..index"""
+        i = min(index + 1, len(self.counts))
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+
+class Leaderboard:
+    """Win count of every user plus the top RANK_CHART_SIZE users.
+
+    Rank is 1 + the number of users with strictly more wins, as in
+    UserDAO.get_rank; the chart is ordered like get_rank_list, by wins and
+    then by user id, both descending. Wins only ever grow, so only a user
+    who just won can enter the chart.
+    """
+
+    def __init__(self, user_dao=None, size=RANK_CHART_SIZE):
+        self.user_dao = user_dao if user_dao is not None else UserDAO()
+        self.size = size
+        self._lock = threading.Lock()
+        # user id -> wins, and how many users have each win count
+        self._wins = {}
+        self._by_wins = FenwickTree(64)
+        # The chart: copies of its users sorted by (-wins, -id), and cached payload
+        self._top = []
+        self._payload = None
+        self.load()
+
+    def load(self):
+        """(Re)build everything from the database"""
+        wins = dict(self.user_dao.get_win_counts())
+        top = self.user_dao.get_rank_list(self.size)
+        with self._lock:
+            self._wins = wins
+            self._by_wins = FenwickTree(max(64, max(wins.values(), default=0) + 1))
+            for count in wins.values():
+                self._by_wins.add(count, 1)
+            self._top = sorted(top, key=self._key)
+            self._payload = None
+
+    def _key(self, user):
+        return -self._wins.get(user.id, user.num_wins), -user.id
+
+    def _rank(self, wins):
+        return 1 + len(self._wins) - self._by_wins.prefix(wins)
+
+    def rank(self, user_id):
+        """Rank of a user by wins"""
+        with self._lock:
+            return self._rank(self._wins.get(user_id, 0))
+
+    def add_user(self, user):
+        """Count a newly registered user"""
+        with self._lock:
+            if user.id in self._wins:
+                return
+            self._wins[user.id] = user.num_wins
+            self._by_wins.add(user.num_wins, 1)
+            self._update_top(user, 0, 0)
+
+    def record(self, user, games=0, wins=0, draws=0):
+        """Add a game result; user's own counters must already include it"""
+        with self._lock:
+            old = self._wins.get(user.id)
+            if old is None:
+                old = max(user.num_wins - wins, 0)
+                self._by_wins.add(old, 1)
+            if wins:
+                self._by_wins.add(old, -1)
+                self._by_wins.add(old + wins, 1)
+            self._wins[user.id] = old + wins
+            self._update_top(user, games, draws)
+
+    def _update_top(self, user, games, draws):
+        for entry in self._top:
+            if entry.id == user.id:
+                entry.num_games += games
+                entry.num_draws += draws
+                entry.num_wins = self._wins[user.id]
+                self._top.sort(key=self._key)
+                self._payload = None
+                return
+        if len(self._top) < self.size or self._key(user) < self._key(self._top[-1]):
+            entry = copy.copy(user)
+            entry.num_wins = self._wins[user.id]
+            self._top.append(entry)
+            self._top.sort(key=self._key)
+            del self._top[self.size:]
+            self._payload = None
+
+    def rank_charts_payload(self):
+        """The return-get-rank-charts message, rebuilt only after a change"""
+        with self._lock:
+            if self._payload is None:
+                parts = ["return-get-rank-charts"]
+                # Positions in the chart, as get_rank_list numbers them
+                for position, user in enumerate(self._top, 1):
+                    user.rank = position
+                    parts.append(user.to_string())
+                self._payload = ",".join(parts)
+            return self._payload
+
+
+_leaderboard = None
+_leaderboard_lock = threading.Lock()
+
+
+def get_leaderboard():
+    """The process-wide leaderboard, loaded on first use"""
+    global _leaderboard
+    with _leaderboard_lock:
+        if _leaderboard is None:
+            _leaderboard = Leaderboard()
+        return _leaderboard
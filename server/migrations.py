@@ -0,0 +1,117 @@
+"""
+Versioned schema migrations for the Caro Game database
+Applied versions are recorded in schema_version; running again only
+applies the ones that are missing
+
+Usage: python server/migrations.py [--status]
+"""
+
+import argparse
+import sys
+import os
+
+import mysql.connector
+from mysql.connector import Error
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Import from same directory
+from config import DB_CONFIG
+
+
+def _add_index(cursor, table, name, columns):
+    """CREATE INDEX unless it exists (DDL commits by itself, so a migration
+    interrupted halfway must be safe to run again)"""
+    cursor.execute("""SELECT 1 FROM information_schema.statistics
+                      WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+                      LIMIT 1""", (table, name))
+    if cursor.fetchone() is None:
+        cursor.execute(f"CREATE INDEX {name} ON `{table}` ({columns})")
+
+
+def migration_001(cursor):
+    # get_rank counts users above a win count and get_rank_list reads the
+    # top by (numberOfWin, ID) descending: both become index range scans
+    _add_index(cursor, 'user', 'idx_user_wins', 'numberOfWin, ID')
+
+
+def migration_002(cursor):
+    # The primary key (ID_User1, ID_User2) only serves lookups by the first
+    # user; friend lists and checks also search by the second
+    _add_index(cursor, 'friend', 'idx_friend_user2', 'ID_User2, ID_User1')
+
+
+# (version, description, function of a cursor), in order
+MIGRATIONS = [
+    (1, "index user by numberOfWin", migration_001),
+    (2, "index friend by ID_User2", migration_002),
+]
+
+
+def applied_versions(cursor):
+    """Versions already recorded in schema_version (created if missing)"""
+    cursor.execute("""CREATE TABLE IF NOT EXISTS schema_version(
+                          version int PRIMARY KEY,
+                          description varchar(255) NOT NULL,
+                          applied_at timestamp DEFAULT CURRENT_TIMESTAMP
+                      )""")
+    cursor.execute("SELECT version FROM schema_version")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def migrate(connection):
+    """Apply every pending migration in order; returns the versions applied"""
+    cursor = connection.cursor()
+    try:
+        done = applied_versions(cursor)
+        applied = []
+        for version, description, apply in MIGRATIONS:
+            if version in done:
+                continue
+            print(f"Applying migration {version}: {description}")
+            apply(cursor)
+            cursor.execute("INSERT INTO schema_version(version, description) VALUES(%s, %s)",
+                           (version, description))
+            connection.commit()
+            applied.append(version)
+        return applied
+    finally:
+        cursor.close()
+
+
+def status(connection):
+    """(version, description, applied) for every migration"""
+    cursor = connection.cursor()
+    try:
+        done = applied_versions(cursor)
+    finally:
+        cursor.close()
+    return [(version, description, version in done) for version, description, _ in MIGRATIONS]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply database migrations")
+    parser.add_argument("--status", action="store_true", help="list migrations without applying")
+    args = parser.parse_args()
+
+    try:
+        connection = mysql.connector.connect(**DB_CONFIG)
+    except Error as e:
+        print(f"Error connecting to MySQL: {e}")
+        sys.exit(1)
+    try:
+        if args.status:
+            for version, description, applied in status(connection):
+                print(f"{version:>4} {'applied' if applied else 'pending':<8} {description}")
+        else:
+            applied = migrate(connection)
+            print(f"Applied {len(applied)} migration(s)" if applied else "Database is up to date")
+    except Error as e:
+        print(f"Migration failed: {e}")
+        sys.exit(1)
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+In-memory presence registry
+Who is online and who is playing lives here, keyed by user id; the
+IsOnline/IsPlaying columns are only a periodic copy for outside readers
+"""
+
+import threading
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Import from same directory
+from config import PRESENCE_PERSIST_INTERVAL
+from user_dao import UserDAO
+
+
+class PresenceRegistry:
+    """Online users and their playing flag, the source of truth for
+    duplicate-login checks and friend-list status.
+
+    Changed users are written to the database every `interval` seconds by
+    a background thread and once more by close().
+    """
+
+    def __init__(self, user_dao=None, interval=PRESENCE_PERSIST_INTERVAL):
+        self.user_dao = user_dao if user_dao is not None else UserDAO()
+        self.interval = interval
+        # user id -> playing, for online users only
+        self._online = {}
+        # user ids whose state changed since the last persist
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._persist_lock = threading.Lock()
+        self._stop = threading.Event()
+        # Nobody is connected yet, whatever the columns say after a crash
+        self.user_dao.reset_presence()
+        self._thread = threading.Thread(target=self._run, name="presence", daemon=True)
+        self._thread.start()
+
+    def login(self, user_id):
+        """Mark a user online; False if they already are (duplicate login)"""
+        with self._lock:
+            if user_id in self._online:
+                return False
+            self._online[user_id] = False
+            self._dirty.add(user_id)
+            return True
+
+    def logout(self, user_id):
+        with self._lock:
+            if self._online.pop(user_id, None) is not None:
+                self._dirty.add(user_id)
+
+    def set_playing(self, user_id, playing):
+        """Set the playing flag of an online user"""
+        with self._lock:
+            if user_id in self._online and self._online[user_id] != playing:
+                self._online[user_id] = playing
+                self._dirty.add(user_id)
+
+    def status(self, user_id):
+        """(online, playing) of a user"""
+        with self._lock:
+            playing = self._online.get(user_id)
+            return playing is not None, bool(playing)
+
+    def is_online(self, user_id):
+        with self._lock:
+            return user_id in self._online
+
+    def online_count(self):
+        with self._lock:
+            return len(self._online)
+
+    def persist(self):
+        """Write the state of every changed user in one transaction"""
+        with self._persist_lock:
+            with self._lock:
+                dirty, self._dirty = self._dirty, set()
+                states = {user_id: (user_id in self._online, bool(self._online.get(user_id)))
+                          for user_id in dirty}
+            if not states:
+                return True
+            if self.user_dao.save_presence(states):
+                return True
+            # Retry these users next time; their current state will be read then
+            with self._lock:
+                self._dirty |= dirty
+            return False
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.persist()
+
+    def close(self):
+        """Stop the persist thread and write the remaining changes"""
+        self._stop.set()
+        self._thread.join()
+        self.persist()
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_presence():
+    """The process-wide registry, started on first use"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = PresenceRegistry()
+        return _registry
+
+
+def close_presence():
+    """Persist and stop the process-wide registry, if one was started"""
+    with _registry_lock:
+        if _registry is not None:
+            _registry.close()
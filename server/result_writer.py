@@ -0,0 +1,104 @@
+"""
+Write-behind batching of game results
+Counter deltas are collected per user in memory and written together in
+one transaction every RESULT_FLUSH_INTERVAL seconds
+"""
+
+import threading
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Import from same directory
+from config import RESULT_FLUSH_INTERVAL
+from user_dao import UserDAO
+
+
+class ResultWriter:
+    """Coalesces numberOfGame/Win/Draw deltas per user.
+
+    A background thread flushes every `interval` seconds; close() stops it
+    and flushes what is left. A failed flush keeps its changes pending for
+    the next one.
+    """
+
+    def __init__(self, user_dao=None, interval=RESULT_FLUSH_INTERVAL):
+        self.user_dao = user_dao if user_dao is not None else UserDAO()
+        self.interval = interval
+        # user id -> [games, wins, draws] not yet written
+        self._counters = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="result-writer", daemon=True)
+        self._thread.start()
+
+    def _add(self, user_id, games=0, wins=0, draws=0):
+        with self._lock:
+            counters = self._counters.setdefault(user_id, [0, 0, 0])
+            counters[0] += games
+            counters[1] += wins
+            counters[2] += draws
+
+    def add_game(self, user_id):
+        self._add(user_id, games=1)
+
+    def add_win(self, user_id):
+        self._add(user_id, wins=1)
+
+    def add_draw(self, user_id):
+        self._add(user_id, draws=1)
+
+    def pending(self):
+        """Number of users with unwritten changes"""
+        with self._lock:
+            return len(self._counters)
+
+    def flush(self):
+        """Write all pending changes in one transaction; returns success"""
+        with self._flush_lock:
+            with self._lock:
+                counters, self._counters = self._counters, {}
+            if not counters:
+                return True
+            if self.user_dao.apply_results(counters):
+                return True
+            # Rolled back: add the deltas back for the next flush
+            with self._lock:
+                for user_id, (games, wins, draws) in counters.items():
+                    now = self._counters.setdefault(user_id, [0, 0, 0])
+                    now[0] += games
+                    now[1] += wins
+                    now[2] += draws
+            return False
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def close(self):
+        """Stop the flush thread and write what is still pending"""
+        self._stop.set()
+        self._thread.join()
+        self.flush()
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_result_writer():
+    """The process-wide writer, started on first use"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = ResultWriter()
+        return _writer
+
+
+def close_result_writer():
+    """Flush and stop the process-wide writer, if one was started"""
+    with _writer_lock:
+        if _writer is not None:
+            _writer.close()
@@ -2,13 +2,24 @@
 Room management for game sessions
 """
 
+import threading
 import sys
 import os
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from user_dao import UserDAO
+from result_writer import get_result_writer
+from presence import get_presence
+from leaderboard import get_leaderboard
+from shared.constants import WIN_CONDITION
+
+# Results of Room.play_move
+MOVE_OK = "ok"
+MOVE_WIN = "win"
+MOVE_NOT_PLAYING = "not-playing"
+MOVE_NOT_YOUR_TURN = "not-your-turn"
+MOVE_OCCUPIED = "occupied"
 
 
 class Room:
@@ -20,7 +31,23 @@ class Room:
         self.user1 = user1_thread
         self.user2 = None
         self.password = ""
-        self.user_dao = UserDAO()
+        # Result counters are written behind, in batches; playing flags
+        # live in the presence registry
+        self.results = get_result_writer()
+        self.presence = get_presence()
+        self.leaderboard = get_leaderboard()
+        # Authoritative game state: (x, y) -> client number of the stone's
+        # owner, whose turn it is, and whether a game is in progress. Both
+        # players' commands arrive on different threads, so every change
+        # goes through _lock
+        self.board = {}
+        self.turn = None
+        self.playing = False
+        # Client number of the player whose draw offer is pending, and the
+        # players who asked for the next game
+        self.draw_offer = None
+        self.ready = set()
+        self._lock = threading.Lock()
         print(f"Room created successfully, ID: {self.id}")
     
     def set_password(self, password):
@@ -49,6 +76,9 @@ class Room:
             self.user1 = None
         elif self.user2 and self.user2.client_number == client_number:
             self.user2 = None
+        with self._lock:
+            self.ready.discard(client_number)
+        self.end_game()
     
     def broadcast(self, message):
         """Send message to both players in room"""
@@ -73,40 +103,164 @@ class Room:
             return competitor.user.id
         return None
     
+    def start_game(self):
+        """Start a new game on an empty board; the host (user1) moves first.
+
+        Ignored while a game is running; returns whether a game started.
+        """
+        with self._lock:
+            return self._start_game()
+
+    def _start_game(self):
+        if self.playing:
+            return False
+        self.board = {}
+        self.turn = self.user1.client_number if self.user1 else None
+        self.playing = self.is_full() and self.user1 is not None
+        self.draw_offer = None
+        self.ready = set()
+        return self.playing
+
+    def request_new_game(self, client_number):
+        """Mark a player ready for the next game; it starts once both are.
+
+        Returns whether this request started the game.
+        """
+        with self._lock:
+            if self.playing:
+                return False
+            self.ready.add(client_number)
+            players = {user.client_number for user in (self.user1, self.user2) if user}
+            if len(players) < 2 or not players <= self.ready:
+                return False
+            return self._start_game()
+
+    def end_game(self):
+        """Stop accepting moves until the next start_game.
+
+        Returns whether this call ended a running game, so a result is
+        recorded once however many messages race to end it.
+        """
+        with self._lock:
+            return self._end_game()
+
+    def _end_game(self):
+        ended = self.playing
+        self.playing = False
+        self.turn = None
+        self.draw_offer = None
+        return ended
+
+    def offer_draw(self, client_number):
+        """Register a draw offer; returns whether a game is running"""
+        with self._lock:
+            if not self.playing:
+                return False
+            self.draw_offer = client_number
+            return True
+
+    def decline_draw(self, client_number):
+        """Drop the competitor's pending draw offer"""
+        with self._lock:
+            if self.draw_offer is not None and self.draw_offer != client_number:
+                self.draw_offer = None
+
+    def accept_draw(self, client_number):
+        """End the game as a draw if the competitor has an offer pending.
+
+        Returns whether the game ended.
+        """
+        with self._lock:
+            if self.draw_offer is None or self.draw_offer == client_number:
+                return False
+            return self._end_game()
+
+    def play_move(self, client_number, x, y):
+        """Validate and apply a move; returns one of the MOVE_* results.
+
+        The game ends on MOVE_WIN; invalid moves leave the state unchanged.
+        A valid move withdraws any pending draw offer.
+        """
+        with self._lock:
+            if not self.playing:
+                return MOVE_NOT_PLAYING
+            if client_number != self.turn:
+                return MOVE_NOT_YOUR_TURN
+            if (x, y) in self.board:
+                return MOVE_OCCUPIED
+            self.board[(x, y)] = client_number
+            self.draw_offer = None
+            if self.is_five(x, y):
+                self._end_game()
+                return MOVE_WIN
+            competitor = self.get_competitor(client_number)
+            self.turn = competitor.client_number if competitor else None
+            return MOVE_OK
+
+    def is_five(self, x, y):
+        """Whether the stone at (x, y) completes WIN_CONDITION in a row"""
+        owner = self.board.get((x, y))
+        for dx, dy in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            count = 1
+            i, j = x + dx, y + dy
+            while self.board.get((i, j)) == owner:
+                count += 1
+                i += dx; j += dy
+            i, j = x - dx, y - dy
+            while self.board.get((i, j)) == owner:
+                count += 1
+                i -= dx; j -= dy
+            if count >= WIN_CONDITION:
+                return True
+        return False
+
     def set_users_to_playing(self):
         """Update both users to playing status"""
         if self.user1 and self.user1.user:
-            self.user_dao.update_to_playing(self.user1.user.id)
+            self.presence.set_playing(self.user1.user.id, True)
         if self.user2 and self.user2.user:
-            self.user_dao.update_to_playing(self.user2.user.id)
+            self.presence.set_playing(self.user2.user.id, True)
     
     def set_users_to_not_playing(self):
         """Update both users to not playing status"""
         if self.user1 and self.user1.user:
-            self.user_dao.update_to_not_playing(self.user1.user.id)
+            self.presence.set_playing(self.user1.user.id, False)
         if self.user2 and self.user2.user:
-            self.user_dao.update_to_not_playing(self.user2.user.id)
+            self.presence.set_playing(self.user2.user.id, False)
+    
+    def _record(self, user, games=0, wins=0, draws=0):
+        """Count a result on the player's User, the leaderboard and the DB (written behind)"""
+        user.num_games += games
+        user.num_wins += wins
+        user.num_draws += draws
+        self.leaderboard.record(user, games, wins, draws)
+        if games:
+            self.results.add_game(user.id)
+        if wins:
+            self.results.add_win(user.id)
+        if draws:
+            self.results.add_draw(user.id)
     
     def increase_number_of_game(self):
         """Increment game count for both players"""
         if self.user1 and self.user1.user:
-            self.user_dao.add_game(self.user1.user.id)
+            self._record(self.user1.user, games=1)
         if self.user2 and self.user2.user:
-            self.user_dao.add_game(self.user2.user.id)
+            self._record(self.user2.user, games=1)
     
     def increase_win(self, client_number):
         """Increment win count for winner"""
         if self.user1 and self.user1.client_number == client_number:
-            self.user_dao.add_win(self.user1.user.id)
+            self._record(self.user1.user, wins=1)
         elif self.user2 and self.user2.client_number == client_number:
-            self.user_dao.add_win(self.user2.user.id)
+            self._record(self.user2.user, wins=1)
     
     def increase_draw(self):
         """Increment draw count for both players"""
         if self.user1 and self.user1.user:
-            self.user_dao.add_draw(self.user1.user.id)
+            self._record(self.user1.user, draws=1)
         if self.user2 and self.user2.user:
-            self.user_dao.add_draw(self.user2.user.id)
+            self._record(self.user2.user, draws=1)
     
     def __str__(self):
         """String representation of room"""
@@ -14,6 +14,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Import from same directory
 from config import SERVER_HOST, SERVER_PORT, MAX_CLIENTS
 from server_thread import ServerThread
+from result_writer import close_result_writer
+from presence import get_presence, close_presence
+from leaderboard import get_leaderboard
 
 
 class ServerThreadBus:
@@ -64,13 +67,16 @@ class ServerThreadBus:
     
     def broadcast(self, sender_number, message):
         """Send message to all clients except sender"""
+        # Write outside the lock: a failed write closes that client, which
+        # removes it from the bus
         with self.lock:
-            for thread in self.threads:
-                if thread.client_number != sender_number:
-                    try:
-                        thread.write(message)
-                    except:
-                        pass
+            threads = self.threads[:]
+        for thread in threads:
+            if thread.client_number != sender_number:
+                try:
+                    thread.write(message)
+                except:
+                    pass
     
     def broadcast_new_room(self, room):
         """Notify all clients about a new room"""
@@ -120,6 +126,11 @@ class Server:
             self.server_socket.bind((SERVER_HOST, SERVER_PORT))
             self.server_socket.listen(MAX_CLIENTS)
             
+            # Load the leaderboard and reset the presence columns before the
+            # first client connects; both block on the database
+            get_leaderboard()
+            get_presence()
+            
             self.is_running = True
             print(f"Server started on {SERVER_HOST}:{SERVER_PORT}")
             print("Server is waiting to accept users...")
@@ -175,6 +186,10 @@ class Server:
             except:
                 pass
         
+        # Write the game results still held in memory
+        close_result_writer()
+        close_presence()
+        
         print("Server stopped")
 
 
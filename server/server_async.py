@@ -0,0 +1,148 @@
+"""
+asyncio server for Caro Game
+All client connections share one event loop; the blocking database work
+of each command runs on a small, bounded thread pool
+"""
+
+import asyncio
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Import from same directory
+from config import SERVER_HOST, SERVER_PORT, THREAD_POOL_SIZE, LISTEN_BACKLOG
+from server import ServerThreadBus, AdminConsole
+from session import ClientSession
+from user_dao import UserDAO
+from result_writer import close_result_writer
+from presence import get_presence, close_presence
+from leaderboard import get_leaderboard
+
+# A client whose unsent output grows past this is not reading; drop it
+MAX_WRITE_BUFFER = 1024 * 1024
+
+
+class AsyncSession(ClientSession):
+    """Client session on an asyncio stream.
+
+    Commands run on executor threads, so output is handed back to the
+    event loop instead of touching the stream directly.
+    """
+
+    def __init__(self, reader, writer, loop, client_number, server_thread_bus, admin, user_dao):
+        """Initialize session for an accepted stream"""
+        self.reader = reader
+        self.writer = writer
+        self.loop = loop
+        peer = writer.get_extra_info('peername')
+        client_ip = peer[0] if peer else "unknown"
+        ClientSession.__init__(self, client_number, server_thread_bus, admin, client_ip, user_dao)
+
+    def send_line(self, data):
+        """Queue one line on the event loop (safe from any thread)"""
+        self.loop.call_soon_threadsafe(self._send_now, data.encode('utf-8'))
+
+    def _send_now(self, data):
+        if self.writer.is_closing():
+            return
+        self.writer.write(data)
+        if self.writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            print(f"Client {self.client_number} is not reading, dropping connection")
+            self.writer.close()
+
+    def close_transport(self):
+        """Close the stream on the event loop"""
+        if not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.writer.close)
+
+
+class AsyncServer:
+    """Main server class, one event loop for every connection"""
+
+    def __init__(self, host=SERVER_HOST, port=SERVER_PORT, db_workers=THREAD_POOL_SIZE):
+        self.host = host
+        self.port = port
+        self.server_thread_bus = ServerThreadBus()
+        self.admin = AdminConsole()
+        self.client_number = 0
+        # Bounded: at most db_workers commands at once, the rest wait in the
+        # executor queue. Sessions share one DAO over the connection pool.
+        self.executor = ThreadPoolExecutor(max_workers=db_workers, thread_name_prefix="db")
+        self.user_dao = UserDAO()
+        self.server = None
+
+    async def handle_client(self, reader, writer):
+        """Serve one connection until it closes"""
+        loop = asyncio.get_running_loop()
+        session = AsyncSession(reader, writer, loop, self.client_number,
+                               self.server_thread_bus, self.admin, self.user_dao)
+        self.client_number += 1
+        self.server_thread_bus.add(session)
+        session.write(f"server-send-id,{session.client_number}")
+        try:
+            while not session.is_closed:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = line.decode('utf-8').rstrip('\n')
+                if message:
+                    # One command at a time per client keeps its messages in order
+                    await loop.run_in_executor(self.executor, session.process_message, message)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            print(f"Error in client session {session.client_number}: {e}")
+        finally:
+            await loop.run_in_executor(self.executor, session.close)
+
+    async def serve(self):
+        """Listen and serve until cancelled"""
+        # Load the leaderboard and reset the presence columns before the
+        # first client connects; both block on the database
+        get_leaderboard()
+        get_presence()
+        self.server = await asyncio.start_server(
+            self.handle_client, self.host, self.port, backlog=LISTEN_BACKLOG
+        )
+        print(f"Server started on {self.host}:{self.port} (asyncio)")
+        print("Server is waiting to accept users...")
+        self.admin.run()
+        async with self.server:
+            await self.server.serve_forever()
+
+    def stop(self):
+        """Close all client connections and the DB workers"""
+        for session in self.server_thread_bus.threads[:]:
+            try:
+                session.close()
+            except:
+                pass
+        self.executor.shutdown(wait=True)
+        # Write the game results still held in memory
+        close_result_writer()
+        close_presence()
+        print("Server stopped")
+
+
+def main():
+    """Main entry point"""
+    print("="*50)
+    print("Caro Game Server - Python Version (asyncio)")
+    print("="*50)
+
+    server = AsyncServer()
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        print("\nServer interrupted by user")
+    except Exception as e:
+        print(f"Server error: {e}")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
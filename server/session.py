@@ -0,0 +1,329 @@
+"""
+Protocol handling for one client connection, independent of how the
+connection is served (a thread per client or the asyncio event loop)
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Import from same directory
+from user_dao import UserDAO
+from presence import get_presence
+from leaderboard import get_leaderboard
+from room import MOVE_OK, MOVE_WIN
+
+
+class ClientSession:
+    """State and command handling of one connected client.
+
+    Subclasses provide the transport: send_line(data) delivers one
+    newline-terminated line and close_transport() drops the connection.
+    """
+    
+    def __init__(self, client_number, server_thread_bus, admin, client_ip, user_dao=None):
+        """Initialize session state for a client"""
+        self.client_number = client_number
+        self.server_thread_bus = server_thread_bus
+        self.admin = admin
+        self.client_ip = client_ip
+        self.user = None
+        self.room = None
+        self.is_closed = False
+        self.user_dao = user_dao if user_dao is not None else UserDAO()
+        self.presence = get_presence()
+        self.leaderboard = get_leaderboard()
+    
+    def send_line(self, data):
+        """Deliver one line (already newline-terminated) to the client"""
+        raise NotImplementedError
+    
+    def close_transport(self):
+        """Drop the underlying connection"""
+        raise NotImplementedError
+    
+    def write(self, message):
+        """Send message to client"""
+        try:
+            if not self.is_closed:
+                self.send_line(message + "\n")
+        except Exception as e:
+            print(f"Error sending to client {self.client_number}: {e}")
+            self.close()
+    
+    def close(self):
+        """Close connection"""
+        if not self.is_closed:
+            self.is_closed = True
+            try:
+                if self.user:
+                    self.presence.logout(self.user.id)
+                    self.server_thread_bus.broadcast(
+                        self.client_number,
+                        f"chat-server,{self.user.nickname} đã offline"
+                    )
+                    if self.admin:
+                        self.admin.add_message(f"[{self.user.id}] {self.user.nickname} đã offline")
+                
+                if self.room:
+                    competitor = self.room.get_competitor(self.client_number)
+                    if competitor:
+                        competitor.write("competitor-left,")
+                    self.room.remove_user(self.client_number)
+                
+                self.close_transport()
+                self.server_thread_bus.remove(self)
+            except Exception as e:
+                print(f"Error closing client {self.client_number}: {e}")
+    
+    def get_string_from_user(self, user):
+        """Convert user object to string for transmission"""
+        return user.to_string()
+    
+    def process_message(self, message):
+        """Process incoming message from client"""
+        parts = message.split(',')
+        if not parts:
+            return
+        
+        command = parts[0]
+        
+        # Client verification/login
+        if command == "client-verify":
+            username = parts[1] if len(parts) > 1 else ""
+            password = parts[2] if len(parts) > 2 else ""
+            
+            # One query; rank and presence come from memory
+            user, banned = self.user_dao.login(username, password)
+            if not user:
+                self.write(f"wrong-user,{username},{password}")
+            elif banned:
+                self.write(f"banned-user,{username},{password}")
+            elif not self.presence.login(user.id):
+                self.write(f"dupplicate-login,{username},{password}")
+            else:
+                user.rank = self.leaderboard.rank(user.id)
+                self.write(f"login-success,{self.get_string_from_user(user)}")
+                self.user = user
+                self.server_thread_bus.broadcast(
+                    self.client_number,
+                    f"chat-server,{user.nickname} đang online"
+                )
+                if self.admin:
+                    self.admin.add_message(f"[{user.id}] {user.nickname} đang online")
+        
+        # Registration
+        elif command == "register":
+            username = parts[1] if len(parts) > 1 else ""
+            password = parts[2] if len(parts) > 2 else ""
+            nickname = parts[3] if len(parts) > 3 else ""
+            avatar = parts[4] if len(parts) > 4 else "avatar1"
+            
+            if self.user_dao.check_duplicated(username):
+                self.write("duplicate-username,")
+            else:
+                self.user_dao.add_user(username, password, nickname, avatar)
+                user = self.user_dao.verify_user(username, password, with_rank=False)
+                if user:
+                    self.leaderboard.add_user(user)
+                    user.rank = self.leaderboard.rank(user.id)
+                    self.user = user
+                    self.presence.login(self.user.id)
+                    self.server_thread_bus.broadcast(
+                        self.client_number,
+                        f"chat-server,{self.user.nickname} đang online"
+                    )
+                    self.write(f"login-success,{self.get_string_from_user(self.user)}")
+        
+        # Logout
+        elif command == "offline":
+            if self.user:
+                self.presence.logout(self.user.id)
+                if self.admin:
+                    self.admin.add_message(f"[{self.user.id}] {self.user.nickname} đã offline")
+                self.server_thread_bus.broadcast(
+                    self.client_number,
+                    f"chat-server,{self.user.nickname} đã offline"
+                )
+                self.user = None
+        
+        # View friend list
+        elif command == "view-friend-list":
+            if self.user:
+                friends = self.user_dao.get_list_friend(self.user.id)
+                friend_str = "friend-list"
+                for friend in friends:
+                    # Live status comes from the registry, not the DB columns
+                    friend.is_online, friend.is_playing = self.presence.status(friend.id)
+                    friend_str += f",{friend.id},{friend.nickname},"
+                    friend_str += f"{'1' if friend.is_online else '0'},"
+                    friend_str += f"{'1' if friend.is_playing else '0'}"
+                self.write(friend_str)
+        
+        # Get rank list
+        elif command == "get-rank-charts":
+            self.write(self.leaderboard.rank_charts_payload())
+        
+        # Check if friend
+        elif command == "check-friend":
+            if self.user and len(parts) > 1:
+                friend_id = int(parts[1])
+                is_friend = self.user_dao.check_friend(self.user.id, friend_id)
+                self.write(f"check-friend-response,{'1' if is_friend else '0'}")
+        
+        # Get room list
+        elif command == "get-list-room":
+            print(f"[DEBUG] Client {self.client_number} requesting room list")
+            room_list_str = "room-list"
+            for room in self.server_thread_bus.rooms:
+                if room.user1 and room.user1.user:
+                    room_list_str += f",{room.id},{room.get_number_of_users()},"
+                    room_list_str += f"{room.user1.user.nickname},"
+                    room_list_str += f"{'1' if room.password else '0'}"
+            print(f"[DEBUG] Sending room list: {room_list_str}")
+            self.write(room_list_str)
+        
+        # Create room
+        elif command == "create-room":
+            password = parts[1] if len(parts) > 1 else ""
+            print(f"[DEBUG] Client {self.client_number} creating room with password: '{password}'")
+            from room import Room
+            new_room = Room(self.server_thread_bus.get_next_room_id(), self)
+            if password:
+                new_room.set_password(password)
+            self.room = new_room
+            self.server_thread_bus.add_room(new_room)
+            print(f"[DEBUG] Room {new_room.id} created, total rooms: {len(self.server_thread_bus.rooms)}")
+            self.write(f"create-room-success,{new_room.id}")
+            # Notify others about new room
+            print(f"[DEBUG] Broadcasting new room to other clients")
+            self.server_thread_bus.broadcast_new_room(new_room)
+        
+        # Join room
+        elif command == "join-room":
+            if len(parts) > 1:
+                room_id = int(parts[1])
+                password = parts[2] if len(parts) > 2 else ""
+                
+                room = self.server_thread_bus.find_room(room_id)
+                if not room:
+                    self.write("room-not-found,")
+                elif room.is_full():
+                    self.write("room-fully,")
+                elif room.password and room.password != password:
+                    self.write("room-wrong-password,")
+                else:
+                    room.add_user(self)
+                    self.room = room
+                    room.start_game()
+                    # Notify both players
+                    self.go_to_partner_room()
+                    room.user1.go_to_own_room()
+        
+        # Leave room
+        elif command == "leave-room":
+            if self.room:
+                competitor = self.room.get_competitor(self.client_number)
+                if competitor:
+                    competitor.write("competitor-left,")
+                self.room.remove_user(self.client_number)
+                self.server_thread_bus.remove_room(self.room)
+                self.room = None
+        
+        # Start game; ignored while a game is running
+        elif command == "start-game":
+            if self.room and self.room.is_full() and self.room.start_game():
+                self.room.set_users_to_playing()
+                self.room.broadcast("start-game,")
+        
+        # New game after a finished one: starts once both players asked, so
+        # neither can move while the other still shows the last result
+        elif command == "new-game":
+            if self.room and self.room.is_full():
+                self.room.request_new_game(self.client_number)
+        
+        # User move: validated against the room's board before forwarding
+        elif command == "user-move":
+            if self.room and len(parts) > 2:
+                try:
+                    x, y = int(parts[1]), int(parts[2])
+                except ValueError:
+                    self.write(f"invalid-move,{parts[1]},{parts[2]}")
+                    return
+                result = self.room.play_move(self.client_number, x, y)
+                if result not in (MOVE_OK, MOVE_WIN):
+                    self.write(f"invalid-move,{x},{y},{result}")
+                    return
+                competitor = self.room.get_competitor(self.client_number)
+                if competitor:
+                    competitor.write(f"competitor-move,{x},{y}")
+                if result == MOVE_WIN:
+                    self.room.increase_number_of_game()
+                    self.room.increase_win(self.client_number)
+                    self.room.set_users_to_not_playing()
+                    if competitor:
+                        competitor.write("you-lose,")
+        
+        # Win: already recorded when the winning move arrived; a claim the
+        # server's board does not back is ignored
+        elif command == "win":
+            pass
+        
+        # Lose (timeout or resignation); counted only by the call that ends the game
+        elif command == "lose":
+            if self.room:
+                competitor = self.room.get_competitor(self.client_number)
+                if competitor and self.room.end_game():
+                    self.room.increase_number_of_game()
+                    self.room.increase_win(competitor.client_number)
+                    self.room.set_users_to_not_playing()
+                    competitor.write("you-win,")
+        
+        # Draw request: remembered until the next move or the end of the game
+        elif command == "draw-request":
+            if self.room and self.room.offer_draw(self.client_number):
+                competitor = self.room.get_competitor(self.client_number)
+                if competitor:
+                    competitor.write("draw-request,")
+        
+        elif command == "draw-decline":
+            if self.room:
+                self.room.decline_draw(self.client_number)
+        
+        # Draw accept: only of the competitor's pending offer
+        elif command == "draw-accept":
+            if self.room and self.room.accept_draw(self.client_number):
+                self.room.increase_number_of_game()
+                self.room.increase_draw()
+                self.room.set_users_to_not_playing()
+                competitor = self.room.get_competitor(self.client_number)
+                if competitor:
+                    competitor.write("draw-accept,")
+        
+        # Chat/send message
+        elif command == "send-message":
+            if self.room and len(parts) > 1:
+                msg = ','.join(parts[1:])
+                competitor = self.room.get_competitor(self.client_number)
+                if competitor:
+                    competitor.write(f"receive-message,{msg}")
+    
+    def go_to_own_room(self):
+        """Notify user about going to their room"""
+        if self.room and self.room.user2:
+            competitor = self.room.user2
+            self.write(
+                f"go-to-room,{self.room.id},{competitor.client_ip},1,"
+                f"{self.get_string_from_user(competitor.user)}"
+            )
+    
+    def go_to_partner_room(self):
+        """Notify user about joining partner's room"""
+        if self.room and self.room.user1:
+            host = self.room.user1
+            self.write(
+                f"go-to-room,{self.room.id},{host.client_ip},0,"
+                f"{self.get_string_from_user(host.user)}"
+            )
@@ -2,7 +2,6 @@
 User Data Access Object for database operations
 """
 
-import mysql.connector
 from mysql.connector import Error
 import sys
 import os
@@ -10,36 +9,30 @@ import os
 # Add parent directory to path to import shared modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Import from same directory
-from config import DB_CONFIG
+from db_pool import get_pool
 from shared.models import User
 
 
 class UserDAO:
     """Handle all database operations for users"""
     
-    def __init__(self):
-        """Initialize database connection"""
-        try:
-            self.connection = mysql.connector.connect(**DB_CONFIG)
-            if self.connection.is_connected():
-                print("Database connection successful")
-        except Error as e:
-            print(f"Error connecting to MySQL: {e}")
-            self.connection = None
+    def __init__(self, pool=None):
+        """Use the shared connection pool; connections are taken per call"""
+        self.pool = pool if pool is not None else get_pool()
     
-    def verify_user(self, username, password):
-        """Verify user credentials"""
+    def verify_user(self, username, password, with_rank=True):
+        """Verify user credentials; with_rank=False leaves rank 0 for the
+        caller to fill in from the leaderboard"""
         try:
-            cursor = self.connection.cursor()
-            query = """SELECT ID, username, password, nickname, avatar, 
-                       numberOfGame, numberOfWin, numberOfDraw, IsOnline, IsPlaying
-                       FROM user WHERE username = %s AND password = %s"""
-            cursor.execute(query, (username, password))
-            result = cursor.fetchone()
-            cursor.close()
+            with self.pool.cursor() as cursor:
+                query = """SELECT ID, username, password, nickname, avatar, 
+                           numberOfGame, numberOfWin, numberOfDraw, IsOnline, IsPlaying
+                           FROM user WHERE username = %s AND password = %s"""
+                cursor.execute(query, (username, password))
+                result = cursor.fetchone()
             
             if result:
-                rank = self.get_rank(result[0])
+                rank = self.get_rank(result[0]) if with_rank else 0
                 return User(
                     user_id=result[0],
                     username=result[1],
@@ -58,15 +51,49 @@ class UserDAO:
             print(f"Error verifying user: {e}")
             return None
     
+    def login(self, username, password):
+        """Credentials and ban status in one query.
+
+        Returns (user, banned), or (None, False) for wrong credentials.
+        The user's rank is left 0 for the caller to take from the
+        leaderboard, and presence is not touched.
+        """
+        try:
+            with self.pool.cursor() as cursor:
+                query = """SELECT u.ID, u.username, u.password, u.nickname, u.avatar,
+                           u.numberOfGame, u.numberOfWin, u.numberOfDraw,
+                           u.IsOnline, u.IsPlaying, b.ID_User IS NOT NULL
+                           FROM user u LEFT JOIN banned_user b ON b.ID_User = u.ID
+                           WHERE u.username = %s AND u.password = %s"""
+                cursor.execute(query, (username, password))
+                result = cursor.fetchone()
+            
+            if result:
+                user = User(
+                    user_id=result[0],
+                    username=result[1],
+                    password=result[2],
+                    nickname=result[3],
+                    avatar=result[4],
+                    num_games=result[5],
+                    num_wins=result[6],
+                    num_draws=result[7],
+                    is_online=result[8] != 0,
+                    is_playing=result[9] != 0
+                )
+                return user, result[10] != 0
+            return None, False
+        except Error as e:
+            print(f"Error logging in: {e}")
+            return None, False
+    
     def add_user(self, username, password, nickname, avatar):
         """Add new user to database"""
         try:
-            cursor = self.connection.cursor()
-            query = """INSERT INTO user(username, password, nickname, avatar)
-                       VALUES(%s, %s, %s, %s)"""
-            cursor.execute(query, (username, password, nickname, avatar))
-            self.connection.commit()
-            cursor.close()
+            with self.pool.cursor() as cursor:
+                query = """INSERT INTO user(username, password, nickname, avatar)
+                           VALUES(%s, %s, %s, %s)"""
+                cursor.execute(query, (username, password, nickname, avatar))
             return True
         except Error as e:
             print(f"Error adding user: {e}")
@@ -75,11 +102,10 @@ class UserDAO:
     def check_duplicated(self, username):
         """Check if username already exists"""
         try:
-            cursor = self.connection.cursor()
-            query = "SELECT * FROM user WHERE username = %s"
-            cursor.execute(query, (username,))
-            result = cursor.fetchone()
-            cursor.close()
+            with self.pool.cursor() as cursor:
+                query = "SELECT * FROM user WHERE username = %s"
+                cursor.execute(query, (username,))
+                result = cursor.fetchone()
             return result is not None
         except Error as e:
             print(f"Error checking duplicate: {e}")
@@ -88,11 +114,10 @@ class UserDAO:
     def check_is_banned(self, user_id):
         """Check if user is banned"""
         try:
-            cursor = self.connection.cursor()
-            query = "SELECT * FROM banned_user WHERE ID_User = %s"
-            cursor.execute(query, (user_id,))
-            result = cursor.fetchone()
-            cursor.close()
+            with self.pool.cursor() as cursor:
+                query = "SELECT * FROM banned_user WHERE ID_User = %s"
+                cursor.execute(query, (user_id,))
+                result = cursor.fetchone()
             return result is not None
         except Error as e:
             print(f"Error checking ban status: {e}")
@@ -101,104 +126,134 @@ class UserDAO:
     def update_to_online(self, user_id):
         """Update user status to online"""
         try:
-            cursor = self.connection.cursor()
-            query = "UPDATE user SET IsOnline = 1 WHERE ID = %s"
-            cursor.execute(query, (user_id,))
-            self.connection.commit()
-            cursor.close()
+            with self.pool.cursor() as cursor:
+                query = "UPDATE user SET IsOnline = 1 WHERE ID = %s"
+                cursor.execute(query, (user_id,))
         except Error as e:
             print(f"Error updating online status: {e}")
     
     def update_to_offline(self, user_id):
         """Update user status to offline"""
         try:
-            cursor = self.connection.cursor()
-            query = "UPDATE user SET IsOnline = 0, IsPlaying = 0 WHERE ID = %s"
-            cursor.execute(query, (user_id,))
-            self.connection.commit()
-            cursor.close()
+            with self.pool.cursor() as cursor:
+                query = "UPDATE user SET IsOnline = 0, IsPlaying = 0 WHERE ID = %s"
+                cursor.execute(query, (user_id,))
         except Error as e:
             print(f"Error updating offline status: {e}")
     
     def update_to_playing(self, user_id):
         """Update user status to playing"""
         try:
-            cursor = self.connection.cursor()
-            query = "UPDATE user SET IsPlaying = 1 WHERE ID = %s"
-            cursor.execute(query, (user_id,))
-            self.connection.commit()
-            cursor.close()
+            with self.pool.cursor() as cursor:
+                query = "UPDATE user SET IsPlaying = 1 WHERE ID = %s"
+                cursor.execute(query, (user_id,))
         except Error as e:
             print(f"Error updating playing status: {e}")
     
     def update_to_not_playing(self, user_id):
         """Update user status to not playing"""
         try:
-            cursor = self.connection.cursor()
-            query = "UPDATE user SET IsPlaying = 0 WHERE ID = %s"
-            cursor.execute(query, (user_id,))
-            self.connection.commit()
-            cursor.close()
+            with self.pool.cursor() as cursor:
+                query = "UPDATE user SET IsPlaying = 0 WHERE ID = %s"
+                cursor.execute(query, (user_id,))
         except Error as e:
             print(f"Error updating not playing status: {e}")
     
     def add_game(self, user_id):
         """Increment number of games played"""
         try:
-            cursor = self.connection.cursor()
-            query = "UPDATE user SET numberOfGame = numberOfGame + 1 WHERE ID = %s"
-            cursor.execute(query, (user_id,))
-            self.connection.commit()
-            cursor.close()
+            with self.pool.cursor() as cursor:
+                query = "UPDATE user SET numberOfGame = numberOfGame + 1 WHERE ID = %s"
+                cursor.execute(query, (user_id,))
         except Error as e:
             print(f"Error adding game count: {e}")
     
     def add_win(self, user_id):
         """Increment number of wins"""
         try:
-            cursor = self.connection.cursor()
-            query = "UPDATE user SET numberOfWin = numberOfWin + 1 WHERE ID = %s"
-            cursor.execute(query, (user_id,))
-            self.connection.commit()
-            cursor.close()
+            with self.pool.cursor() as cursor:
+                query = "UPDATE user SET numberOfWin = numberOfWin + 1 WHERE ID = %s"
+                cursor.execute(query, (user_id,))
         except Error as e:
             print(f"Error adding win count: {e}")
     
     def add_draw(self, user_id):
         """Increment number of draws"""
         try:
-            cursor = self.connection.cursor()
-            query = "UPDATE user SET numberOfDraw = numberOfDraw + 1 WHERE ID = %s"
-            cursor.execute(query, (user_id,))
-            self.connection.commit()
-            cursor.close()
+            with self.pool.cursor() as cursor:
+                query = "UPDATE user SET numberOfDraw = numberOfDraw + 1 WHERE ID = %s"
+                cursor.execute(query, (user_id,))
         except Error as e:
             print(f"Error adding draw count: {e}")
     
+    def apply_results(self, counters):
+        """Add batched (games, wins, draws) deltas per user id in one transaction"""
+        try:
+            with self.pool.cursor(transaction=True) as cursor:
+                # Fixed ID order so concurrent batches lock rows the same way
+                query = """UPDATE user SET numberOfGame = numberOfGame + %s,
+                           numberOfWin = numberOfWin + %s, numberOfDraw = numberOfDraw + %s
+                           WHERE ID = %s"""
+                cursor.executemany(query, [(g, w, d, user_id) for user_id, (g, w, d)
+                                           in sorted(counters.items())])
+            return True
+        except Error as e:
+            print(f"Error applying game results: {e}")
+            return False
+    
+    def save_presence(self, states):
+        """Write IsOnline/IsPlaying for user id -> (online, playing) in one transaction"""
+        try:
+            with self.pool.cursor(transaction=True) as cursor:
+                query = "UPDATE user SET IsOnline = %s, IsPlaying = %s WHERE ID = %s"
+                cursor.executemany(query, [(1 if online else 0, 1 if playing else 0, user_id)
+                                           for user_id, (online, playing) in sorted(states.items())])
+            return True
+        except Error as e:
+            print(f"Error saving presence: {e}")
+            return False
+    
+    def reset_presence(self):
+        """Mark every user offline and not playing"""
+        try:
+            with self.pool.cursor() as cursor:
+                cursor.execute("UPDATE user SET IsOnline = 0, IsPlaying = 0 "
+                               "WHERE IsOnline <> 0 OR IsPlaying <> 0")
+        except Error as e:
+            print(f"Error resetting presence: {e}")
+    
     def get_rank(self, user_id):
         """Get user's rank based on wins"""
         try:
-            cursor = self.connection.cursor()
-            query = """SELECT COUNT(*) + 1 FROM user 
-                       WHERE numberOfWin > (SELECT numberOfWin FROM user WHERE ID = %s)"""
-            cursor.execute(query, (user_id,))
-            result = cursor.fetchone()
-            cursor.close()
+            with self.pool.cursor() as cursor:
+                query = """SELECT COUNT(*) + 1 FROM user 
+                           WHERE numberOfWin > (SELECT numberOfWin FROM user WHERE ID = %s)"""
+                cursor.execute(query, (user_id,))
+                result = cursor.fetchone()
             return result[0] if result else 0
         except Error as e:
             print(f"Error getting rank: {e}")
             return 0
     
-    def get_rank_list(self):
+    def get_win_counts(self):
+        """(ID, numberOfWin) of every user"""
+        try:
+            with self.pool.cursor() as cursor:
+                cursor.execute("SELECT ID, numberOfWin FROM user")
+                return cursor.fetchall()
+        except Error as e:
+            print(f"Error getting win counts: {e}")
+            return []
+    
+    def get_rank_list(self, limit=100):
         """Get top users by rank"""
         try:
-            cursor = self.connection.cursor()
-            query = """SELECT ID, username, password, nickname, avatar, 
-                       numberOfGame, numberOfWin, numberOfDraw, 0 as rank
-                       FROM user ORDER BY numberOfWin DESC LIMIT 100"""
-            cursor.execute(query)
-            results = cursor.fetchall()
-            cursor.close()
+            with self.pool.cursor() as cursor:
+                query = """SELECT ID, username, password, nickname, avatar, 
+                           numberOfGame, numberOfWin, numberOfDraw, 0 as rank
+                           FROM user ORDER BY numberOfWin DESC, ID DESC LIMIT %s"""
+                cursor.execute(query, (limit,))
+                results = cursor.fetchall()
             
             users = []
             for i, row in enumerate(results):
@@ -222,14 +277,17 @@ class UserDAO:
     def get_list_friend(self, user_id):
         """Get user's friend list"""
         try:
-            cursor = self.connection.cursor()
-            query = """SELECT u.ID, u.nickname, u.IsOnline, u.IsPlaying
-                       FROM user u
-                       INNER JOIN friend f ON (f.ID_User1 = %s AND f.ID_User2 = u.ID)
-                       OR (f.ID_User2 = %s AND f.ID_User1 = u.ID)"""
-            cursor.execute(query, (user_id, user_id))
-            results = cursor.fetchall()
-            cursor.close()
+            with self.pool.cursor() as cursor:
+                # One indexed lookup per side instead of an OR join
+                query = """SELECT u.ID, u.nickname, u.IsOnline, u.IsPlaying
+                           FROM friend f INNER JOIN user u ON u.ID = f.ID_User2
+                           WHERE f.ID_User1 = %s
+                           UNION ALL
+                           SELECT u.ID, u.nickname, u.IsOnline, u.IsPlaying
+                           FROM friend f INNER JOIN user u ON u.ID = f.ID_User1
+                           WHERE f.ID_User2 = %s"""
+                cursor.execute(query, (user_id, user_id))
+                results = cursor.fetchall()
             
             friends = []
             for row in results:
@@ -248,13 +306,12 @@ class UserDAO:
     def check_friend(self, user1_id, user2_id):
         """Check if two users are friends"""
         try:
-            cursor = self.connection.cursor()
-            query = """SELECT * FROM friend 
-                       WHERE (ID_User1 = %s AND ID_User2 = %s)
-                       OR (ID_User1 = %s AND ID_User2 = %s)"""
-            cursor.execute(query, (user1_id, user2_id, user2_id, user1_id))
-            result = cursor.fetchone()
-            cursor.close()
+            with self.pool.cursor() as cursor:
+                query = """SELECT * FROM friend 
+                           WHERE (ID_User1 = %s AND ID_User2 = %s)
+                           OR (ID_User1 = %s AND ID_User2 = %s)"""
+                cursor.execute(query, (user1_id, user2_id, user2_id, user1_id))
+                result = cursor.fetchone()
             return result is not None
         except Error as e:
             print(f"Error checking friend: {e}")
@@ -263,18 +320,15 @@ class UserDAO:
     def add_friend(self, user1_id, user2_id):
         """Add friend relationship"""
         try:
-            cursor = self.connection.cursor()
-            query = "INSERT INTO friend(ID_User1, ID_User2) VALUES(%s, %s)"
-            cursor.execute(query, (user1_id, user2_id))
-            self.connection.commit()
-            cursor.close()
+            with self.pool.cursor() as cursor:
+                query = "INSERT INTO friend(ID_User1, ID_User2) VALUES(%s, %s)"
+                cursor.execute(query, (user1_id, user2_id))
             return True
         except Error as e:
             print(f"Error adding friend: {e}")
             return False
     
     def close(self):
-        """Close database connection"""
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
-            print("Database connection closed")
+        """Close the pool's idle connections"""
+        self.pool.close()
+        print("Database connection closed")
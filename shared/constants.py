@@ -24,6 +24,7 @@ WIN_CONDITION = 5  # 5 in a row to win
 
 # Game Timer
 GAME_TIMEOUT = 60  # 60 seconds per turn
+AI_TIME_SHARE = 0.05  # AI may think for this fraction of the turn time
 
 # Protocol Messages
 class Messages:
@@ -0,0 +1,222 @@
+# Headless AI benchmark and regression check
+#
+# Runs the tactical corpus (tools/tactics.txt), a fixed-depth search speed test and
+# self-play matches between difficulties on several board sizes, then
+# prints a report and writes it as JSON. With --baseline, a drop in
+# nodes/sec or in solved positions beyond --tolerance exits with status 1.
+#
+# Usage: python tools/ai_benchmark.py [--out FILE] [--baseline FILE]
+#        [--games N] [--sizes 15,19] [--move-time SECONDS] [--quick]
+import sys, os, time, json, random, argparse, platform, tracemalloc
+from datetime import datetime
+# add project root and client/ to path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'client'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from ai_player import AIPlayer
+from ai_board import BitBoard
+from bench_ai_search import make_position
+import tactics
+
+MATCHUPS = [("easy", "medium"), ("medium", "hard"), ("easy", "hard")]
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+def time_stats(times):
+    if not times:
+        return {}
+    return {"moves": len(times), "mean": sum(times) / len(times),
+            "p50": percentile(times, 50), "p90": percentile(times, 90),
+            "p99": percentile(times, 99), "max": max(times)}
+
+
+def run_tactical(difficulties, move_time):
+    """Solve the tactical corpus (tools/tactics.txt) at each difficulty"""
+    positions = tactics.load_corpus()
+    report = {}
+    for difficulty in difficulties:
+        results = tactics.run(positions, difficulty, move_time)
+        report[difficulty] = {"results": results, "summary": tactics.summarize(results)}
+    return report
+
+
+def run_search_speed(depth=4, seeds=4):
+    """Fixed-depth searches: deterministic node counts, so nodes/sec is comparable"""
+    report = {}
+    for size in (15, 31):
+        ai = AIPlayer('hard')
+        ai.threats = None
+        ai.book = None
+        ai.max_depth = depth
+        nodes = 0
+        elapsed = 0.0
+        for seed in range(seeds):
+            board = make_position(size, 16, seed + 10)
+            ai.nodes = 0
+            ai.tt.clear()
+            start = time.perf_counter()
+            ai.get_best_move(board, time_limit=600)
+            elapsed += time.perf_counter() - start
+            nodes += ai.nodes
+        report[f"{size}x{size}"] = {"depth": depth, "nodes": nodes, "seconds": elapsed,
+                                    "nodes_per_sec": nodes / elapsed}
+    return report
+
+
+def run_memory(move_time):
+    """Peak traced allocation of creating a hard AI and searching one position"""
+    tracemalloc.start()
+    ai = AIPlayer('hard')
+    ai.book = None
+    ai.get_best_move(make_position(15, 16, 10), time_limit=move_time)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"peak_mb": peak / (1024 * 1024), "tt_slots": ai.tt.size}
+
+
+def play_game(players, size, seed, move_time):
+    """One game; players maps symbol -> AIPlayer. Returns (winner, per-move
+    (symbol, seconds, nodes) list); winner 0 is a draw."""
+    rng = random.Random(seed)
+    board = BitBoard(size)
+    # Seeded opening stones so repeated pairings play different games
+    c = size // 2
+    board.place(board.index(c, c), 1)
+    while len(board.moves) < 2:
+        idx = board.index(c + rng.randint(-2, 2), c + rng.randint(-2, 2))
+        if not board.cells[idx]:
+            board.place(idx, 2)
+    moves = []
+    symbol = 1
+    while not board.is_full():
+        ai = players[symbol]
+        nodes = ai.nodes
+        start = time.perf_counter()
+        move = ai.get_move(board, move_time)
+        moves.append((symbol, time.perf_counter() - start, ai.nodes - nodes))
+        if move is None:
+            break
+        idx = board.index(*move)
+        board.place(idx, symbol)
+        if board.is_five_at(idx):
+            return symbol, moves
+        symbol = 3 - symbol
+    return 0, moves
+
+
+def run_selfplay(sizes, games, move_time):
+    """Each matchup plays `games` games per size, alternating colours"""
+    report = {}
+    for first, second in MATCHUPS:
+        for size in sizes:
+            wins = {first: 0, second: 0, "draw": 0}
+            times = {first: [], second: []}
+            nodes = {first: 0, second: 0}
+            for game in range(games):
+                names = (first, second) if game % 2 == 0 else (second, first)
+                players = {}
+                for symbol, name in zip((1, 2), names):
+                    ai = AIPlayer(name, board_size=size)
+                    ai.ai_symbol, ai.player_symbol = symbol, 3 - symbol
+                    players[symbol] = ai
+                winner, moves = play_game(players, size, game, move_time)
+                wins[names[winner - 1] if winner else "draw"] += 1
+                for symbol, seconds, count in moves:
+                    times[names[symbol - 1]].append(seconds)
+                    nodes[names[symbol - 1]] += count
+            report[f"{first}-vs-{second}/{size}x{size}"] = {
+                "games": games, "wins": wins,
+                "win_rate": {name: wins[name] / games for name in (first, second)},
+                "move_time": {name: time_stats(times[name]) for name in (first, second)},
+                "nodes_per_sec": {name: nodes[name] / max(sum(times[name]), 1e-9)
+                                  for name in (first, second)},
+            }
+    return report
+
+
+def regressions(report, baseline, tolerance):
+    """Messages for every metric that got worse than baseline by more than tolerance"""
+    problems = []
+    for board, now in report["search"].items():
+        before = baseline.get("search", {}).get(board)
+        if before and now["nodes_per_sec"] < before["nodes_per_sec"] * (1 - tolerance):
+            problems.append(f"search {board}: {now['nodes_per_sec']:.0f} nodes/s "
+                            f"vs {before['nodes_per_sec']:.0f} in baseline")
+    for difficulty, now in report["tactical"].items():
+        before = baseline.get("tactical", {}).get(difficulty)
+        if before and now["summary"]["all"]["solved"] < before["summary"]["all"]["solved"]:
+            problems.append(f"tactical {difficulty}: {now['summary']['all']['solved']} solved "
+                            f"vs {before['summary']['all']['solved']} in baseline")
+    return problems
+
+
+def print_report(report):
+    print(f"\n{'level':<7} {'kind':<14} {'solved':>8} {'mean s':>8} {'max s':>8}")
+    for difficulty, r in report["tactical"].items():
+        for kind, s in r["summary"].items():
+            mean = f"{s['mean_seconds']:.3f}" if s["solved"] else '-'
+            worst = f"{s['max_seconds']:.3f}" if s["solved"] else '-'
+            print(f"{difficulty:<7} {kind:<14} {s['solved']:>3}/{s['positions']:<4} {mean:>8} {worst:>8}")
+    print(f"\n{'board':<7} {'depth':>5} {'nodes':>8} {'seconds':>8} {'nodes/s':>9}")
+    for board, r in report["search"].items():
+        print(f"{board:<7} {r['depth']:>5} {r['nodes']:>8} {r['seconds']:>8.3f} {r['nodes_per_sec']:>9.0f}")
+    m = report["memory"]
+    print(f"\nmemory peak {m['peak_mb']:.1f} MB (transposition table {m['tt_slots']} slots)")
+    print(f"\n{'match':<26} {'player':<7} {'win%':>5} {'p50 s':>7} {'p90 s':>7} {'p99 s':>7} {'nodes/s':>9}")
+    for match, r in report["selfplay"].items():
+        for name, rate in r["win_rate"].items():
+            t = r["move_time"][name] or {"p50": 0, "p90": 0, "p99": 0}
+            print(f"{match:<26} {name:<7} {rate * 100:>5.0f} {t['p50']:>7.3f} {t['p90']:>7.3f} "
+                  f"{t['p99']:>7.3f} {r['nodes_per_sec'][name]:>9.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless AI benchmark")
+    parser.add_argument("--out", default="ai_benchmark.json", help="JSON report path")
+    parser.add_argument("--baseline", help="earlier JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed relative nodes/sec drop (default 0.2)")
+    parser.add_argument("--games", type=int, default=2, help="games per matchup and size")
+    parser.add_argument("--sizes", default="15,19", help="board sizes for self-play")
+    parser.add_argument("--move-time", type=float, default=0.3, help="seconds per AI move")
+    parser.add_argument("--quick", action="store_true", help="one size, one game per matchup")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',')]
+    games = args.games
+    if args.quick:
+        sizes, games = sizes[:1], 1
+
+    report = {
+        "meta": {"date": datetime.now().isoformat(timespec="seconds"),
+                 "python": platform.python_version(), "platform": platform.platform(),
+                 "cpu_count": os.cpu_count(), "move_time": args.move_time,
+                 "sizes": sizes, "games": games},
+        "tactical": run_tactical(("medium", "hard"), args.move_time),
+        "search": run_search_speed(),
+        "memory": run_memory(args.move_time),
+        "selfplay": run_selfplay(sizes, games, args.move_time),
+    }
+    print_report(report)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nreport written to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            problems = regressions(report, json.load(f), args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION {problem}")
+        if problems:
+            sys.exit(1)
+        print("no regressions against baseline")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# Benchmark from-scratch evaluation and batched move scoring of list-of-lists
+# boards: BitBoard vs NumPy backend
+import sys, os, random, time
+# add project root and client/ to path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'client'))
+from ai_player import AIPlayer
+from ai_numpy import HAS_NUMPY
+
+
+def make_grid(size, stones, seed):
+    """Random list-of-lists position with about `stones` stones"""
+    rng = random.Random(seed)
+    grid = [[0] * size for _ in range(size)]
+    for k in range(stones):
+        grid[rng.randrange(size)][rng.randrange(size)] = 1 + k % 2
+    return grid
+
+
+def time_calls(ai, grids):
+    """Microseconds per evaluate_board + check_winner pair"""
+    start = time.perf_counter()
+    for grid in grids:
+        ai.evaluate_board(grid)
+        ai.check_winner(grid, 1)
+    return (time.perf_counter() - start) / len(grids) * 1e6
+
+
+def time_scoring(ai, grids):
+    """Microseconds per score_moves call, and candidates scored per call"""
+    start = time.perf_counter()
+    candidates = sum(len(ai.score_moves(grid)) for grid in grids)
+    return (time.perf_counter() - start) / len(grids) * 1e6, candidates // len(grids)
+
+
+if __name__ == '__main__':
+    if not HAS_NUMPY:
+        sys.exit("NumPy is not installed")
+    python_ai = AIPlayer('medium', backend='python')
+    numpy_ai = AIPlayer('medium', backend='numpy')
+    print(f"{'board':>6} {'stones':>6} {'python us':>10} {'numpy us':>9} {'speedup':>8}")
+    for size in (15, 31, 63):
+        for stones in (20, size * size // 3):
+            grids = [make_grid(size, stones, seed) for seed in range(50)]
+            for grid in grids:
+                assert python_ai.evaluate_board(grid) == numpy_ai.evaluate_board(grid)
+            py = time_calls(python_ai, grids)
+            np_ = time_calls(numpy_ai, grids)
+            print(f"{size:>4}x{size:<2} {stones:>6} {py:>10.0f} {np_:>9.0f} {py / np_:>7.1f}x")
+
+    print(f"\n{'board':>6} {'stones':>6} {'moves':>6} {'python us':>10} {'numpy us':>9} {'speedup':>8}")
+    for size in (15, 31, 63):
+        for stones in (20, size * size // 3):
+            grids = [make_grid(size, stones, seed) for seed in range(50)]
+            py, moves = time_scoring(python_ai, grids)
+            np_, _ = time_scoring(numpy_ai, grids)
+            print(f"{size:>4}x{size:<2} {stones:>6} {moves:>6} {py:>10.0f} {np_:>9.0f} {py / np_:>7.1f}x")
@@ -0,0 +1,45 @@
+# Benchmark root-parallel AI search speedup from 1 to N worker processes
+import sys, os, time
+# add project root and client/ to path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'client'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from ai_player import AIPlayer
+from bench_ai_search import make_position
+
+DEPTH = 4
+POSITIONS = [(15, seed) for seed in range(10, 14)] + [(31, seed) for seed in range(10, 12)]
+
+
+def run(workers):
+    """Seconds to search every test position to DEPTH, and the moves chosen"""
+    ai = AIPlayer('hard', workers=workers)
+    ai.threats = None
+    ai.max_depth = DEPTH
+    moves = []
+    elapsed = 0.0
+    try:
+        # warm the pool up so process start-up is not timed
+        ai.get_best_move(make_position(15, 16, 0), time_limit=600)
+        for size, seed in POSITIONS:
+            board = make_position(size, 16, seed)
+            ai.tt.clear()
+            start = time.perf_counter()
+            moves.append(ai.get_best_move(board, time_limit=600))
+            elapsed += time.perf_counter() - start
+    finally:
+        ai.close()
+    return elapsed, moves
+
+
+if __name__ == '__main__':
+    cores = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, cores})
+    print(f"cpu cores: {cores}, depth {DEPTH}, {len(POSITIONS)} positions")
+    print(f"{'workers':>7} {'seconds':>8} {'speedup':>8} {'same moves':>10}")
+    base_time, base_moves = run(1)
+    for workers in counts:
+        elapsed, moves = (base_time, base_moves) if workers == 1 else run(workers)
+        same = sum(a == b for a, b in zip(moves, base_moves))
+        print(f"{workers:>7} {elapsed:>8.2f} {base_time / elapsed:>7.2f}x {same:>5}/{len(moves)}")
@@ -0,0 +1,97 @@
+# Benchmark minimax nodes/sec with full-board vs last-move win detection
+import sys, os, random, time
+# add project root and client/ to path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'client'))
+from ai_player import AIPlayer
+from ai_board import BitBoard
+
+
+def make_position(size, stones, seed):
+    """Random middle-game position clustered around the center"""
+    rng = random.Random(seed)
+    board = BitBoard(size)
+    c = size // 2
+    symbol = 1
+    while len(board.moves) < stones:
+        i = rng.randint(c - 4, c + 4)
+        j = rng.randint(c - 4, c + 4)
+        idx = board.index(i, j)
+        if not board.cells[idx]:
+            board.place(idx, symbol)
+            symbol = 3 - symbol
+    return board
+
+
+def search(ai, board, incremental):
+    """Root loop of get_best_move, with or without threading the last move"""
+    ai.nodes = 0
+    ai.tt.clear()
+    start = time.perf_counter()
+    for move in ai.get_smart_moves(board):
+        idx = board.index(*move)
+        board.place(idx, ai.ai_symbol)
+        ai.minimax(board, 0, False, float('-inf'), float('inf'),
+                   idx if incremental else None)
+        board.undo()
+    return ai.nodes, time.perf_counter() - start
+
+
+def terminal_checks(board, incremental, rounds=2000):
+    """Cost of the terminal test alone, per node"""
+    idx = board.moves[-1]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        if incremental:
+            board.is_five_at(idx)
+        else:
+            board.has_five(1)
+            board.has_five(2)
+    return (time.perf_counter() - start) / rounds
+
+
+def nodes_per_move(ai, size, depth, seeds=4):
+    """Nodes and seconds for get_best_move to finish a fixed depth"""
+    ai.max_depth = depth
+    nodes = 0
+    elapsed = 0.0
+    for seed in range(seeds):
+        board = make_position(size, 16, seed + 10)
+        ai.nodes = 0
+        ai.tt.clear()
+        start = time.perf_counter()
+        ai.get_best_move(board, time_limit=600)
+        elapsed += time.perf_counter() - start
+        nodes += ai.nodes
+    return nodes // seeds, elapsed / seeds
+
+
+if __name__ == '__main__':
+    ai = AIPlayer('hard')
+    ai.search_depth = 2
+    print(f"{'board':>6} {'mode':>12} {'nodes':>8} {'seconds':>8} {'nodes/s':>9}")
+    for size in (15, 31):
+        for label, incremental in (('full-scan', False), ('last-move', True)):
+            nodes = 0
+            elapsed = 0.0
+            for seed in range(3):
+                board = make_position(size, 16, seed)
+                n, t = search(ai, board, incremental)
+                nodes += n
+                elapsed += t
+            print(f"{size:>4}x{size:<2} {label:>11} {nodes:>8} {elapsed:>8.3f} {nodes / elapsed:>9.0f}")
+
+    print(f"\n{'board':>6} {'mode':>12} {'us/check':>9}")
+    for size in (15, 31):
+        for label, incremental in (('full-scan', False), ('last-move', True)):
+            board = make_position(size, 40, 0)
+            print(f"{size:>4}x{size:<2} {label:>11} {terminal_checks(board, incremental) * 1e6:>9.2f}")
+
+    print(f"\n{'board':>6} {'depth':>6} {'nodes/move':>11} {'s/move':>8}")
+    for size in (15, 31):
+        for depth in (3, 4):
+            ai = AIPlayer('hard')
+            ai.threats = None
+            n, t = nodes_per_move(ai, size, depth)
+            print(f"{size:>4}x{size:<2} {depth:>6} {n:>11} {t:>8.3f}")
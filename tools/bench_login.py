@@ -0,0 +1,207 @@
+# Login-storm benchmark
+#
+# Usage: python tools/bench_login.py [--accounts 200] [--threads 10] [--seconds 5]
+#        python tools/bench_login.py --server 127.0.0.1:7777 [--clients 200] [--seconds 5]
+# Without --server, logs the accounts storm_1..N in from `threads` threads
+# straight against the database, first through the old per-login sequence
+# (verify_user with its COUNT rank query, check_is_banned, the IsOnline
+# UPDATE and its COMMIT, on a connection of its own without autocommit, as
+# each old ServerThread had) then through UserDAO.login on the pool with
+# the rank from the leaderboard, and prints logins/sec for both. With --server, `clients` connections loop
+# client-verify / offline against a running server.
+# Missing storm_* accounts are created for the run and deleted at the end.
+import sys, os, time, asyncio, argparse, threading
+# add project root and server/ to path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'server'))
+
+PREFIX = "storm_"
+
+
+def account(i):
+    return f"{PREFIX}{i}"
+
+
+def ensure_accounts(dao, count):
+    """Create the storm_* accounts that do not exist yet; returns their names"""
+    created = []
+    for i in range(1, count + 1):
+        name = account(i)
+        if not dao.check_duplicated(name) and dao.add_user(name, name, name, "avatar1"):
+            created.append(name)
+    if created:
+        print(f"created {len(created)} accounts")
+    return created
+
+
+def remove_accounts(dao, names):
+    """Delete the accounts ensure_accounts created"""
+    if not names:
+        return
+    with dao.pool.cursor() as cursor:
+        cursor.executemany("DELETE FROM user WHERE username = %s", [(name,) for name in names])
+    print(f"deleted {len(names)} accounts")
+
+
+def legacy_session(dao, leaderboard):
+    """One thread's login before UserDAO.login, as (login, close).
+
+    Runs the old statements on a private connection without autocommit:
+    verify_user's SELECT, its COUNT rank query, check_is_banned, the
+    IsOnline UPDATE and its COMMIT, five round trips per login.
+    """
+    import mysql.connector
+    from config import DB_CONFIG
+    connection = mysql.connector.connect(**DB_CONFIG)
+
+    def login(name):
+        cursor = connection.cursor()
+        try:
+            cursor.execute("""SELECT ID, username, password, nickname, avatar,
+                              numberOfGame, numberOfWin, numberOfDraw, IsOnline, IsPlaying
+                              FROM user WHERE username = %s AND password = %s""", (name, name))
+            row = cursor.fetchone()
+            if not row:
+                return False
+            cursor.execute("""SELECT COUNT(*) + 1 FROM user
+                              WHERE numberOfWin > (SELECT numberOfWin FROM user WHERE ID = %s)""",
+                           (row[0],))
+            cursor.fetchone()
+            cursor.execute("SELECT * FROM banned_user WHERE ID_User = %s", (row[0],))
+            if cursor.fetchone() is not None:
+                return False
+            cursor.execute("UPDATE user SET IsOnline = 1 WHERE ID = %s", (row[0],))
+            connection.commit()
+            return True
+        finally:
+            cursor.close()
+
+    return login, connection.close
+
+
+def single_query_session(dao, leaderboard):
+    """One thread's UserDAO.login on the pool plus the in-memory rank, as (login, close)"""
+    def login(name):
+        user, banned = dao.login(name, name)
+        if user and not banned:
+            user.rank = leaderboard.rank(user.id)
+        return bool(user) and not banned
+
+    return login, lambda: None
+
+
+def storm(session, dao, leaderboard, accounts, threads, seconds):
+    """Logins per second of `threads` threads, each logging in through its
+    own session(dao, leaderboard) for `seconds`"""
+    counts = [0] * threads
+    failures = [0] * threads
+    # Connections are set up before the clock starts, as the old server
+    # opened one per client, not per login
+    sessions = [session(dao, leaderboard) for _ in range(threads)]
+    deadline = time.perf_counter() + seconds
+
+    def worker(t):
+        login = sessions[t][0]
+        i = t
+        while time.perf_counter() < deadline:
+            if login(account(i % accounts + 1)):
+                counts[t] += 1
+            else:
+                failures[t] += 1
+            i += threads
+
+    workers = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    for _, close in sessions:
+        close()
+    return sum(counts) / elapsed, sum(failures)
+
+
+def run_dao(args, dao):
+    from leaderboard import Leaderboard
+    leaderboard = Leaderboard(dao)
+    print(f"{args.threads} threads, {args.accounts} accounts, {args.seconds}s per path")
+    results = {}
+    for name, session in (("old sequence", legacy_session), ("single query", single_query_session)):
+        rate, failures = storm(session, dao, leaderboard, args.accounts, args.threads, args.seconds)
+        results[name] = rate
+        print(f"{name:<14} {rate:>9.0f} logins/s" + (f"  ({failures} failed)" if failures else ""))
+    print(f"speedup {results['single query'] / results['old sequence']:.2f}x")
+    # The old sequence marked the accounts online
+    for i in range(1, args.accounts + 1):
+        user = dao.verify_user(account(i), account(i), with_rank=False)
+        if user:
+            dao.update_to_offline(user.id)
+
+
+async def server_client(host, port, names, deadline, counts):
+    reader, writer = await asyncio.open_connection(host, port)
+    await reader.readline()
+    i = 0
+    while time.perf_counter() < deadline:
+        name = names[i % len(names)]
+        i += 1
+        writer.write(f"client-verify,{name},{name}\n".encode())
+        await writer.drain()
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            if line.startswith((b"login-success", b"wrong-user", b"banned-user", b"dupplicate-login")):
+                break
+        if line.startswith(b"login-success"):
+            counts["ok"] += 1
+            writer.write(b"offline\n")
+        else:
+            counts["failed"] += 1
+    writer.close()
+
+
+async def run_server(args):
+    host, port = args.server.rsplit(":", 1)
+    # Each client cycles through its own accounts, so no two are online twice
+    per_client = max(1, args.accounts // args.clients)
+    counts = {"ok": 0, "failed": 0}
+    deadline = time.perf_counter() + args.seconds
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        server_client(host, int(port),
+                      [account(c * per_client + k + 1) for k in range(per_client)],
+                      deadline, counts)
+        for c in range(args.clients)))
+    elapsed = time.perf_counter() - start
+    print(f"{args.clients} clients: {counts['ok'] / elapsed:.0f} logins/s"
+          + (f"  ({counts['failed']} failed)" if counts["failed"] else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Login-storm benchmark")
+    parser.add_argument("--accounts", type=int, default=200, help="storm_* accounts to use")
+    parser.add_argument("--threads", type=int, default=10, help="DB mode: concurrent logins")
+    parser.add_argument("--seconds", type=float, default=5.0, help="duration of each run")
+    parser.add_argument("--server", help="HOST:PORT of a running server to storm instead")
+    parser.add_argument("--clients", type=int, default=100, help="server mode: connections")
+    args = parser.parse_args()
+
+    if args.server and args.clients > args.accounts:
+        parser.error("--clients must not exceed --accounts")
+    from user_dao import UserDAO
+    dao = UserDAO()
+    created = ensure_accounts(dao, args.accounts)
+    try:
+        if args.server:
+            asyncio.run(run_server(args))
+        else:
+            run_dao(args, dao)
+    finally:
+        remove_accounts(dao, created)
+
+
+if __name__ == '__main__':
+    main()
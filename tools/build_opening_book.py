@@ -0,0 +1,69 @@
+# Build client/opening_book.txt by searching the first moves of AI games
+#
+# Usage: python tools/build_opening_book.py [plies] [seconds per position] [replies]
+# The player (X) moves first; for every position with the AI (O) to move
+# up to `plies` stones, the hard AI's choice is stored. Player moves are
+# the `replies` best-ordered candidates of each position.
+import sys, os, time
+# add project root and client/ to path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'client'))
+from ai_player import AIPlayer
+from ai_board import BitBoard
+from ai_opening import BOOK_FILE, canonical, to_canonical
+
+SIZE = 15
+
+
+def place_centered(stones):
+    """BitBoard with the stones (canonical coords) around the middle, and the shift used"""
+    board = BitBoard(SIZE)
+    shift = SIZE // 2 - max((max(x, y) for x, y, _ in stones), default=0) // 2
+    for x, y, s in stones:
+        board.place(board.index(x + shift, y + shift), s)
+    return board, shift
+
+
+def build(plies, seconds, replies):
+    ai = AIPlayer('hard')
+    ai.book = None
+    book = {}
+    # Positions with the player to move, as canonical stone lists
+    frontier = [[]]
+    while frontier:
+        position = frontier.pop(0)
+        board, shift = place_centered(position)
+        if position:
+            moves = [board.coords(idx) for idx in ai._ordered_moves(board, 1, 0)[:replies]]
+        else:
+            moves = [(SIZE // 2, SIZE // 2)]
+        for i, j in moves:
+            stones = position + [(i - shift, j - shift, 1)]
+            key, transform, offset = canonical(stones)
+            if key in book:
+                continue
+            ai_board, ai_shift = place_centered(stones)
+            start = time.perf_counter()
+            mi, mj = ai.get_best_move(ai_board, time_limit=seconds)
+            mx, my = to_canonical(mi - ai_shift, mj - ai_shift, transform, offset)
+            book[key] = (mx, my)
+            print(f"{len(book):>4} {len(stones):>2} stones {time.perf_counter() - start:5.2f}s {key} -> {mx},{my}")
+            if len(stones) + 2 <= plies:
+                canon = [tuple(int(v) for v in p.split(',')) for p in key.split(';')]
+                frontier.append(canon + [(mx, my, 2)])
+    return book
+
+
+if __name__ == '__main__':
+    plies = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+    replies = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    book = build(plies, seconds, replies)
+    with open(BOOK_FILE, 'w', encoding='utf-8') as f:
+        f.write(f"# Caro opening book: {len(book)} positions, up to {plies} stones, "
+                f"{seconds}s hard search each\n")
+        f.write("# canonical stones (x,y,symbol;...) then the AI reply x,y\n")
+        for key in sorted(book, key=lambda k: (k.count(';'), k)):
+            f.write(f"{key} {book[key][0]},{book[key][1]}\n")
+    print(f"wrote {len(book)} positions to {BOOK_FILE}")
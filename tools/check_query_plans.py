@@ -0,0 +1,129 @@
+# Query-plan check for the server's hot queries
+#
+# Usage: python tools/check_query_plans.py [--seed N] [--verbose]
+# Runs EXPLAIN on the queries behind login, ranks and friend lists and
+# fails (exit status 1) if one of them scans a whole table, sorts with a
+# filesort or needs a temporary table. On a small development database
+# the optimizer may prefer scans anyway, so --seed N first inserts N
+# synthetic users and friendships inside a transaction that is rolled
+# back at the end.
+import sys, os, argparse, random
+# add project root and server/ to path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'server'))
+import mysql.connector
+from mysql.connector import Error
+from config import DB_CONFIG
+
+# (name, query, params); the same statements UserDAO runs
+QUERIES = [
+    ("login",
+     """SELECT u.ID, u.username, u.password, u.nickname, u.avatar, u.numberOfGame,
+        u.numberOfWin, u.numberOfDraw, u.IsOnline, u.IsPlaying, b.ID_User IS NOT NULL
+        FROM user u LEFT JOIN banned_user b ON b.ID_User = u.ID
+        WHERE u.username = %s AND u.password = %s""",
+     ("player1", "player1")),
+    ("verify_user",
+     """SELECT ID, username, password, nickname, avatar, numberOfGame, numberOfWin,
+        numberOfDraw, IsOnline, IsPlaying FROM user WHERE username = %s AND password = %s""",
+     ("player1", "player1")),
+    ("check_is_banned", "SELECT * FROM banned_user WHERE ID_User = %s", (1,)),
+    ("get_rank",
+     """SELECT COUNT(*) + 1 FROM user
+        WHERE numberOfWin > (SELECT numberOfWin FROM user WHERE ID = %s)""",
+     (1,)),
+    ("get_rank_list",
+     """SELECT ID, username, password, nickname, avatar, numberOfGame, numberOfWin,
+        numberOfDraw, 0 as rank FROM user ORDER BY numberOfWin DESC, ID DESC LIMIT %s""",
+     (100,)),
+    ("get_list_friend",
+     """SELECT u.ID, u.nickname, u.IsOnline, u.IsPlaying
+        FROM friend f INNER JOIN user u ON u.ID = f.ID_User2 WHERE f.ID_User1 = %s
+        UNION ALL
+        SELECT u.ID, u.nickname, u.IsOnline, u.IsPlaying
+        FROM friend f INNER JOIN user u ON u.ID = f.ID_User1 WHERE f.ID_User2 = %s""",
+     (1, 1)),
+    ("check_friend",
+     """SELECT * FROM friend WHERE (ID_User1 = %s AND ID_User2 = %s)
+        OR (ID_User1 = %s AND ID_User2 = %s)""",
+     (1, 2, 2, 1)),
+]
+
+BAD_EXTRA = ("Using filesort", "Using temporary")
+
+
+def seed(cursor, count):
+    """Insert count users and a few friendships each (caller rolls back)"""
+    rng = random.Random(0)
+    cursor.executemany(
+        "INSERT INTO user(username, password, nickname, numberOfGame, numberOfWin) "
+        "VALUES(%s, %s, %s, %s, %s)",
+        [(f"plan_check_{i}", "x", f"plan_check_{i}", 50, rng.randint(0, 50)) for i in range(count)])
+    cursor.execute("SELECT MIN(ID), MAX(ID) FROM user WHERE username LIKE 'plan\\_check\\_%'")
+    low, high = cursor.fetchone()
+    pairs = {(rng.randint(low, high), rng.randint(low, high)) for _ in range(count * 3)}
+    cursor.executemany("INSERT IGNORE INTO friend(ID_User1, ID_User2) VALUES(%s, %s)",
+                       [p for p in pairs if p[0] != p[1]])
+
+
+def explain(cursor, query, params):
+    """EXPLAIN rows as dicts"""
+    cursor.execute("EXPLAIN " + query, params)
+    columns = [c[0] for c in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def problems(rows):
+    """Why a plan is bad, one message per offending row"""
+    found = []
+    for row in rows:
+        table = row.get("table")
+        # Derived/union result rows are not table accesses
+        if table is None or str(table).startswith("<"):
+            continue
+        if row.get("type") == "ALL":
+            found.append(f"full scan of {table}")
+        extra = row.get("Extra") or ""
+        for bad in BAD_EXTRA:
+            if bad in extra:
+                found.append(f"{bad.lower()} on {table}")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN the server's hot queries")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic users to add (rolled back)")
+    parser.add_argument("--verbose", action="store_true", help="print every plan row")
+    args = parser.parse_args()
+
+    try:
+        connection = mysql.connector.connect(**DB_CONFIG)
+    except Error as e:
+        print(f"Error connecting to MySQL: {e}")
+        sys.exit(1)
+    cursor = connection.cursor()
+    failed = 0
+    try:
+        if args.seed:
+            seed(cursor, args.seed)
+        for name, query, params in QUERIES:
+            rows = explain(cursor, query, params)
+            found = problems(rows)
+            failed += bool(found)
+            print(f"{'FAIL' if found else 'ok':<5} {name:<16} {'; '.join(found)}")
+            if args.verbose or found:
+                for row in rows:
+                    print(f"      {row.get('table')}: type={row.get('type')} key={row.get('key')} "
+                          f"rows={row.get('rows')} extra={row.get('Extra')}")
+    finally:
+        connection.rollback()
+        cursor.close()
+        connection.close()
+    if failed:
+        print(f"\n{failed} query plan(s) need attention; run server/migrations.py?")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
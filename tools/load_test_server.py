@@ -0,0 +1,119 @@
+# Server load test: open many idle client connections and report memory
+#
+# Usage: python tools/load_test_server.py [--host 127.0.0.1] [--port 7777]
+#        [--pid SERVER_PID] [--clients 2000] [--step 250] [--json FILE]
+# Connections are opened in steps; after each step the server's resident
+# memory and thread count (read from /proc/<pid>/status, Linux only) and
+# the round-trip time of `get-list-room` on a sample of connections are
+# printed. Run it against server/server.py and server/server_async.py to
+# compare thread-per-connection with the asyncio server.
+import sys, os, time, json, asyncio, argparse, resource
+# add project root and server/ to path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'server'))
+from config import SERVER_PORT
+
+SAMPLE = 20
+
+
+def process_status(pid):
+    """(resident MB, threads) of a process, or (None, None) without /proc"""
+    rss = threads = None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    rss = int(line.split()[1]) / 1024
+                elif line.startswith("Threads:"):
+                    threads = int(line.split()[1])
+    except (OSError, TypeError):
+        pass
+    return rss, threads
+
+
+async def connect(host, port):
+    """Open one client connection and wait for its server-send-id"""
+    reader, writer = await asyncio.open_connection(host, port)
+    line = await reader.readline()
+    if not line.startswith(b"server-send-id,"):
+        raise ConnectionError(f"unexpected greeting {line!r}")
+    return reader, writer
+
+
+async def round_trip(reader, writer):
+    """Seconds for a get-list-room request to be answered"""
+    start = time.perf_counter()
+    writer.write(b"get-list-room\n")
+    await writer.drain()
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        # Broadcasts may arrive in between; wait for our answer
+        if line.startswith(b"room-list"):
+            return time.perf_counter() - start
+
+
+async def run(args):
+    connections = []
+    rows = []
+    base_rss, base_threads = process_status(args.pid)
+    rows.append({"clients": 0, "rss_mb": base_rss, "threads": base_threads, "rtt_ms": None})
+    print_row(rows[0], base_rss)
+    target = args.step
+    while target <= args.clients:
+        start = time.perf_counter()
+        while len(connections) < target:
+            batch = min(100, target - len(connections))
+            connections += await asyncio.gather(*(connect(args.host, args.port) for _ in range(batch)))
+        connect_time = time.perf_counter() - start
+        await asyncio.sleep(args.settle)
+        rss, threads = process_status(args.pid)
+        sample = connections[::max(1, len(connections) // SAMPLE)]
+        times = [await round_trip(r, w) for r, w in sample]
+        rows.append({"clients": len(connections), "rss_mb": rss, "threads": threads,
+                     "rtt_ms": 1000 * sum(times) / len(times),
+                     "connect_per_sec": args.step / connect_time})
+        print_row(rows[-1], base_rss)
+        target += args.step
+    for _, writer in connections:
+        writer.close()
+    return rows
+
+
+def print_row(row, base_rss):
+    rss = f"{row['rss_mb']:.1f}" if row["rss_mb"] is not None else '-'
+    per = '-'
+    if row["rss_mb"] is not None and base_rss is not None and row["clients"]:
+        per = f"{(row['rss_mb'] - base_rss) * 1024 / row['clients']:.1f}"
+    threads = row["threads"] if row["threads"] is not None else '-'
+    rtt = f"{row['rtt_ms']:.2f}" if row["rtt_ms"] is not None else '-'
+    print(f"{row['clients']:>8} {rss:>9} {per:>10} {threads:>8} {rtt:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Connections vs memory load test")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--pid", type=int, help="server process id, for memory and threads")
+    parser.add_argument("--clients", type=int, default=2000, help="connections to reach")
+    parser.add_argument("--step", type=int, default=250, help="connections added per step")
+    parser.add_argument("--settle", type=float, default=0.5, help="seconds to wait before sampling")
+    parser.add_argument("--json", help="write the rows here")
+    args = parser.parse_args()
+
+    # Every connection is a file descriptor on this side too
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < args.clients + 100 <= hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (args.clients + 100, hard))
+
+    print(f"{'clients':>8} {'rss MB':>9} {'KB/client':>10} {'threads':>8} {'rtt ms':>8}")
+    rows = asyncio.run(run(args))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
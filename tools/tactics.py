@@ -0,0 +1,130 @@
+# Tactical position corpus: loader and solve-rate runner
+#
+# Usage: python tools/tactics.py [--difficulty hard] [--time 1.0]
+#        [--kind vcf] [--corpus FILE] [--json FILE]
+# Feeds every position of the corpus (tools/tactics.txt) to AIPlayer.get_move
+# for the side to move and reports the solve rate and time-to-solve per kind.
+import sys, os, time, json, argparse
+from collections import namedtuple
+# add project root and client/ to path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'client'))
+from ai_player import AIPlayer
+from ai_board import BitBoard
+
+CORPUS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tactics.txt')
+BOARD_SIZE = 15
+COLUMNS = 'abcdefghijklmnopqrstuvwxyz'
+
+# moves: (i, j) in play order, X first; answers: set of (i, j)
+Position = namedtuple('Position', 'name kind moves answers')
+
+
+def parse_cell(text):
+    """Gomoku notation ('h8') -> (row, column), 0-based"""
+    return int(text[1:]) - 1, COLUMNS.index(text[0])
+
+
+def format_cell(cell):
+    """(row, column) -> gomoku notation"""
+    return f"{COLUMNS[cell[1]]}{cell[0] + 1}"
+
+
+def parse_position(line):
+    """One corpus line `name kind : moves : answers` -> Position"""
+    header, moves, answers = line.split(':')
+    name, kind = header.split()
+    return Position(name, kind, [parse_cell(c) for c in moves.split()],
+                    {parse_cell(c) for c in answers.split()})
+
+
+def load_corpus(path=CORPUS_FILE):
+    """Every position of a corpus file, skipping blank and # lines"""
+    positions = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                positions.append(parse_position(line))
+    return positions
+
+
+def to_move(position):
+    """Symbol of the side to move: 1 (X) after an even number of moves"""
+    return 1 if len(position.moves) % 2 == 0 else 2
+
+
+def make_board(position, size=BOARD_SIZE):
+    """BitBoard with the position's moves played"""
+    board = BitBoard(size)
+    symbol = 1
+    for i, j in position.moves:
+        board.place(board.index(i, j), symbol)
+        symbol = 3 - symbol
+    return board
+
+
+def solve(position, difficulty, time_limit):
+    """Run the AI on one position: (move, solved, seconds)"""
+    ai = AIPlayer(difficulty)
+    ai.ai_symbol = to_move(position)
+    ai.player_symbol = 3 - ai.ai_symbol
+    board = make_board(position)
+    start = time.perf_counter()
+    move = ai.get_move(board, time_limit)
+    return move, move in position.answers, time.perf_counter() - start
+
+
+def run(positions, difficulty, time_limit):
+    """Solve every position; returns one result dict per position"""
+    results = []
+    for position in positions:
+        move, solved, seconds = solve(position, difficulty, time_limit)
+        results.append({"name": position.name, "kind": position.kind,
+                        "move": format_cell(move) if move else None,
+                        "solved": solved, "seconds": seconds})
+    return results
+
+
+def summarize(results):
+    """Per-kind (and 'all') solve rate and time-to-solve of the solved positions"""
+    summary = {}
+    for kind in sorted({r["kind"] for r in results}) + ["all"]:
+        rows = [r for r in results if kind in ("all", r["kind"])]
+        times = [r["seconds"] for r in rows if r["solved"]]
+        summary[kind] = {"positions": len(rows), "solved": len(times),
+                         "solve_rate": len(times) / len(rows),
+                         "mean_seconds": sum(times) / len(times) if times else None,
+                         "max_seconds": max(times) if times else None}
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the tactical corpus")
+    parser.add_argument("--difficulty", default="hard", choices=("easy", "medium", "hard"))
+    parser.add_argument("--time", type=float, default=1.0, help="seconds per position")
+    parser.add_argument("--kind", help="only positions of this kind")
+    parser.add_argument("--corpus", default=CORPUS_FILE)
+    parser.add_argument("--json", help="write per-position results and summary here")
+    args = parser.parse_args()
+
+    positions = [p for p in load_corpus(args.corpus) if args.kind in (None, p.kind)]
+    results = run(positions, args.difficulty, args.time)
+    for r in results:
+        if not r["solved"]:
+            print(f"missed {r['name']}: played {r['move']}")
+    summary = summarize(results)
+    print(f"\n{'kind':<14} {'solved':>8} {'rate':>6} {'mean s':>8} {'max s':>8}")
+    for kind, s in summary.items():
+        mean = f"{s['mean_seconds']:.3f}" if s["solved"] else '-'
+        worst = f"{s['max_seconds']:.3f}" if s["solved"] else '-'
+        print(f"{kind:<14} {s['solved']:>3}/{s['positions']:<4} {s['solve_rate'] * 100:>5.0f}% {mean:>8} {worst:>8}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"difficulty": args.difficulty, "time": args.time,
+                       "results": results, "summary": summary}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()